@@ -0,0 +1,159 @@
+"""操作ログ（セッションを変更したAPI呼び出しの記録）とリプレイ
+
+セッションを変更するエンドポイントは @logged_action を付けて登録する。
+呼び出しごとに (エンドポイント名, パラメータ) をセッションの操作ログに追記し、
+セッション作成時の (キャラクターID, 乱数シード) と合わせれば GameManager を最初から作り直せる。
+
+ゲーム内の乱数はすべてセッションの乱数（GameManager.rng、ショップはsession_seed由来）から引くので、
+同じ順に同じ操作を適用すれば同じ状態になる。400や500で失敗した呼び出しも記録し、
+リプレイでも同じ例外を出して無視する（例外の前に変更した分もそのまま再現される）。
+
+    log = get_action_log(session_id)
+    game = replay_action_log(log)   # オフラインで再現（バグ報告の調査など）
+
+ログ1件は game/snapshot.py のエンコーダで (名前, パラメータ) を詰めたbytes。
+
+記録はハンドラを適用したGameManagerのversion（それまでの操作数）を条件に行う。
+複数ワーカーで同じセッションを同時に操作して先を越されたら、そのワーカーの結果は捨てて
+最新の状態を読み直して適用し直す（ACTION_CONFLICT_RETRIES 回まで、だめなら409）。
+"""
+import functools
+import inspect
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from game.day_cycle import GameManager
+from game.snapshot import decode_value, encode_value
+
+
+@dataclass
+class ActionLog:
+    """1セッション分の操作ログ"""
+    character_id: str
+    seed: int  # GameManagerの乱数シード
+    actions: list[tuple[str, dict]] = field(default_factory=list)  # [(エンドポイント名, パラメータ), ...]
+
+
+# エンドポイント名 → (ハンドラ, {パラメータ名: Pydanticモデル or None})
+ACTION_HANDLERS: dict[str, tuple[Callable, dict[str, type[BaseModel] | None]]] = {}
+
+# 他のワーカーに先を越されたときに読み直して適用し直す回数
+ACTION_CONFLICT_RETRIES = 3
+
+# 処理中の操作が使うGameManager（スレッドごと）。設定中はハンドラがセッションの代わりにこれを使う。
+# replaying が真ならリプレイ中で、記録しない
+_bound = threading.local()
+
+
+def encode_action(name: str, params: dict) -> bytes:
+    """操作1件をbytesにする"""
+    return encode_value((name, params))
+
+
+def decode_action(data: bytes) -> tuple[str, dict]:
+    """encode_actionで書いた操作1件を読む"""
+    name, params = decode_value(data)
+    return name, params
+
+
+def get_bound_game() -> GameManager | None:
+    """処理中の操作（記録・リプレイ）のGameManager（ハンドラがセッションの代わりに使う）"""
+    return getattr(_bound, 'game', None)
+
+
+@contextmanager
+def _bind_game(game: GameManager, replaying: bool) -> Iterator[None]:
+    """このスレッドのハンドラが使うGameManagerを設定する"""
+    previous = (getattr(_bound, 'game', None), getattr(_bound, 'replaying', False))
+    _bound.game, _bound.replaying = game, replaying
+    try:
+        yield
+    finally:
+        _bound.game, _bound.replaying = previous
+
+
+def _param_models(handler: Callable) -> dict[str, type[BaseModel] | None]:
+    models = {}
+    for name, param in inspect.signature(handler).parameters.items():
+        if name == 'session_id':
+            continue
+        annotation = param.annotation
+        is_model = isinstance(annotation, type) and issubclass(annotation, BaseModel)
+        models[name] = annotation if is_model else None
+    return models
+
+
+def logged_action(handler: Callable) -> Callable:
+    """セッションを変更するエンドポイントに付けて、呼び出しを操作ログに記録する
+
+    セッションのロック（session.session_lock）の中で実行・記録するので、同じセッションへの
+    並行リクエストは1つずつ処理され、ログの順序と適用順が一致する。
+    別のワーカーに先を越されたら（記録時にversionが変わっていたら）結果を捨てて適用し直す。
+    セッションがない（404になる）呼び出しは記録しない。
+    """
+    from .session import compact_session, get_session_with_version, record_action, session_lock
+
+    name = handler.__name__
+    models = _param_models(handler)
+    ACTION_HANDLERS[name] = (handler, models)
+
+    @functools.wraps(handler)
+    def wrapper(session_id: str, **kwargs):
+        if getattr(_bound, 'replaying', False):
+            return handler(session_id, **kwargs)
+        params = {
+            key: value.model_dump() if models.get(key) is not None else value
+            for key, value in kwargs.items()
+        }
+        action = encode_action(name, params)
+        with session_lock(session_id):
+            for _ in range(ACTION_CONFLICT_RETRIES + 1):
+                loaded = get_session_with_version(session_id)
+                if loaded is None:
+                    return handler(session_id, **kwargs)
+                game, version = loaded
+                response = error = None
+                with _bind_game(game, replaying=False):
+                    try:
+                        response = handler(session_id, **kwargs)
+                    except Exception as e:
+                        error = e
+                # 400などで失敗した呼び出しも記録する（リプレイでも同じ例外になる）
+                if record_action(session_id, action, version):
+                    compact_session(session_id)
+                    if error is not None:
+                        raise error
+                    return response
+        raise HTTPException(status_code=409, detail="Session was modified concurrently")
+
+    return wrapper
+
+
+def replay_actions(game: GameManager, actions: list[tuple[str, dict]]) -> GameManager:
+    """操作を順に適用する（例外は元の呼び出しでもエラーレスポンスになっただけなので無視）"""
+    import api.routes  # noqa: F401  ハンドラの登録
+
+    with _bind_game(game, replaying=True):
+        for name, params in actions:
+            handler, models = ACTION_HANDLERS[name]
+            kwargs = {
+                key: models[key].model_validate(value) if models.get(key) is not None else value
+                for key, value in params.items()
+            }
+            try:
+                handler("replay", **kwargs)
+            except Exception:
+                pass
+    return game
+
+
+def replay_action_log(log: ActionLog) -> GameManager:
+    """操作ログからGameManagerを最初から作り直す"""
+    from .session import new_game
+
+    return replay_actions(new_game(log.character_id, log.seed), log.actions)
@@ -1,4 +1,5 @@
 """FastAPI アプリケーション"""
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -7,11 +8,23 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from .routes import router
+from .session import get_session_store, start_session_sweeper, stop_session_sweeper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動中はTTL切れセッションの掃除スレッドを動かす"""
+    start_session_sweeper()
+    yield
+    stop_session_sweeper()
+    get_session_store().close()
+
 
 app = FastAPI(
     title="cooking-sim API",
     description="一人暮らしサバイバルゲーム API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS設定（開発用）
@@ -55,8 +68,10 @@ else:
 @app.get("/health")
 def health():
     """ヘルスチェック"""
-    from .session import get_session_count
+    from .session import get_eviction_counts, get_lock_wait_stats, get_session_count
     return {
         "status": "ok",
         "active_sessions": get_session_count(),
+        "evicted_sessions": get_eviction_counts(),
+        "session_lock_wait": get_lock_wait_stats(),
     }
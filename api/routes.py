@@ -1,31 +1,37 @@
 """APIエンドポイント定義"""
-import random
 from fastapi import APIRouter, HTTPException
 
 import sys
+import weakref
+from functools import lru_cache
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from game.character import get_all_characters, get_character
 from game.ingredients import generate_daily_shop_items, generate_distant_shop_items, get_ingredient
-from game.cooking import cook, find_named_recipe, get_available_named_recipes, evaluate_cooking, get_shop_recipe_suggestions
+from game.cooking import cook, find_named_recipe, get_named_recipes_for_mask, evaluate_cooking, get_shop_recipe_suggestions
 from game.relic import generate_daily_relic_items, get_relic
-from game.provisions import get_all_provisions
+from game.meal_planner import plan_meal
+from game.shop_planner import plan_basket
+from game.provisions import get_all_provisions, get_provision
 from game.day_cycle import GamePhase
 from game.events import EventTiming
 from game.constants import COMMUTE_STAMINA_COST, SHOPPING_STAMINA_COST
 
-from .session import create_session, get_session
+from .action_log import get_bound_game, logged_action
+from .session import create_session, get_action_log, get_session, session_locked
 from .schemas import (
-    StartGameRequest, StartGameResponse,
+    StartGameRequest, StartGameResponse, ActionLogEntry, ActionLogResponse,
     CookRequest, CookResponse, CookPreviewResponse,
+    CookPreviewBatchRequest, CookPreviewBatchResponse,
     MakeBentoRequest, MakeBentoResponse,
     ShopBuyRequest, ShopResponse, ShopItemInfo, ShopRecipeSuggestionInfo,
+    ShopBasketInfo, ShopBasketItemInfo,
     OnlineShopBuyRequest, OnlineShopResponse, OnlineProvisionInfo, OnlineRelicInfo,
     EatProvisionRequest,
     HolidayActionRequest,
     AdvancePhaseResponse, WeeklyEvaluation, BossResult, WeeklyBossInfo,
-    RecipesResponse, NamedRecipeInfo,
+    RecipesResponse, NamedRecipeInfo, MealPlanResponse, MealPlanInfo,
     GameState, PlayerState, NutritionState, StockItem, ProvisionItem,
     PreparedItem, PendingDeliveryItem, EventInfo, DishInfo, CharacterInfo,
     GoShoppingResponse, AutoConsumeInfo,
@@ -33,6 +39,9 @@ from .schemas import (
 
 router = APIRouter(prefix="/api")
 
+# 調理プレビューのバッチで1回に受け付ける候補数の上限
+MAX_COOK_PREVIEW_BATCH = 256
+
 # === ねぎらいメッセージ ===
 ENCOURAGEMENT_MESSAGES = [
     "今日も一日お疲れ様でした！",
@@ -49,122 +58,159 @@ ENCOURAGEMENT_MESSAGES = [
 
 # === ヘルパー関数 ===
 
-def _build_game_state(session_id: str, game) -> GameState:
-    """GameManagerからGameStateを構築"""
-    player = game.player
-    day_state = game.day_state
-    stock = game.stock
-    provisions = game.provisions
-    relics = game.relics
+# フェーズ表示名
+PHASE_NAMES = {
+    GamePhase.BREAKFAST: "朝食",
+    GamePhase.GO_TO_WORK: "出勤",
+    GamePhase.LUNCH: "昼食",
+    GamePhase.LEAVE_WORK: "退勤",
+    GamePhase.SHOPPING: "買い出し",
+    GamePhase.HOLIDAY_SHOPPING_1: "買い出し（午前）",
+    GamePhase.HOLIDAY_LUNCH: "昼食",
+    GamePhase.HOLIDAY_SHOPPING_2: "買い出し（午後）",
+    GamePhase.DINNER: "夕食",
+    GamePhase.ONLINE_SHOPPING: "通販",
+    GamePhase.SLEEP: "就寝",
+    GamePhase.DAY_END: "1日終了",
+}
+
+# 在庫1組ぶんのStockItemを覚えておく数（全セッション共通）
+STOCK_ITEM_CACHE_SIZE = 4096
+
+# GameStateの部品のキャッシュ: GameManager → {部品名: (キー, 値)}
+# キーは部品の元になる状態（Stock / ProvisionStock / RelicInventory の version と日付など）。
+# 変わっていなければPydanticモデルを作り直さずに使い回す（モデルは作った後に書き換えない）
+_state_parts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _state_part(game, part: str, key: tuple, build):
+    """キーが前回と同じならキャッシュした部品を、違えば build() で作り直して返す"""
+    parts = _state_parts.get(game)
+    if parts is None:
+        parts = _state_parts[game] = {}
+    cached = parts.get(part)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = build()
+    parts[part] = (key, value)
+    return value
+
+
+def _nutrition_state(nutrition) -> NutritionState:
+    """Nutrition（食材・料理・献立などの栄養）をレスポンス用のNutritionStateにする"""
+    return NutritionState(
+        vitality=nutrition.vitality,
+        mental=nutrition.mental,
+        awakening=nutrition.awakening,
+        sustain=nutrition.sustain,
+        defense=nutrition.defense,
+    )
 
-    current_day = day_state.day
 
-    # 在庫アイテム構築
-    # stock._items は {食材名: [購入日1, 購入日2, ...]} の形式
-    stock_items = []
-    for name, purchase_days in stock._items.items():
-        ingredient = get_ingredient(name)
-        if ingredient is None:
-            continue
+@lru_cache(maxsize=STOCK_ITEM_CACHE_SIZE)
+def _stock_item(name: str, purchase_day: int, qty: int, freshness_extend: int,
+                current_day: int) -> StockItem | None:
+    """在庫1組（食材・購入日・個数）のStockItem（引数だけで決まるので全セッションで使い回す。StockItemはfrozen）"""
+    ingredient = get_ingredient(name)
+    if ingredient is None:
+        return None
+    expiry_day = purchase_day + ingredient.freshness_days + freshness_extend
+    days_remaining = expiry_day - current_day
+    return StockItem(
+        name=name,
+        category=ingredient.category,
+        quantity=qty,
+        purchase_day=purchase_day,
+        expiry_day=expiry_day,
+        days_remaining=days_remaining,
+        is_expired=days_remaining < 0,
+        nutrition=_nutrition_state(ingredient.nutrition),
+        fullness=ingredient.fullness,
+    )
 
-        # 購入日ごとにグループ化して数量をカウント
-        from collections import Counter
-        day_counts = Counter(purchase_days)
 
-        for purchase_day, qty in day_counts.items():
-            freshness_extend = relics.get_freshness_extend_for_purchase_day(purchase_day)
-            expiry_day = purchase_day + ingredient.freshness_days + freshness_extend
-            days_remaining = expiry_day - current_day
-            stock_items.append(StockItem(
-                name=name,
-                category=ingredient.category,
-                quantity=qty,
-                purchase_day=purchase_day,
-                expiry_day=expiry_day,
-                days_remaining=days_remaining,
-                is_expired=days_remaining < 0,
-                nutrition=NutritionState(
-                    vitality=ingredient.nutrition.vitality,
-                    mental=ingredient.nutrition.mental,
-                    awakening=ingredient.nutrition.awakening,
-                    sustain=ingredient.nutrition.sustain,
-                    defense=ingredient.nutrition.defense,
-                ),
-                fullness=ingredient.fullness,
-            ))
+def _build_stock_items(stock, relics, current_day: int) -> list[StockItem]:
+    """在庫アイテム構築（購入日ごとにまとめた単位で返す）"""
+    stock_items = []
+    for name, purchase_day, qty in stock.iter_batches():
+        freshness_extend = relics.get_freshness_extend_for_purchase_day(purchase_day)
+        item = _stock_item(name, purchase_day, qty, freshness_extend, current_day)
+        if item is not None:
+            stock_items.append(item)
+    return stock_items
+
 
-    # 食糧アイテム構築
+def _build_provision_items(provisions) -> list[ProvisionItem]:
+    """食糧アイテム構築"""
     provision_items = []
-    for name, qty in provisions._items.items():
-        from game.provisions import get_provision
+    for name, qty in provisions.get_all().items():
         prov = get_provision(name)
         if prov:
             provision_items.append(ProvisionItem(
                 name=name,
                 quantity=qty,
-                nutrition=NutritionState(
-                    vitality=prov.nutrition.vitality,
-                    mental=prov.nutrition.mental,
-                    awakening=prov.nutrition.awakening,
-                    sustain=prov.nutrition.sustain,
-                    defense=prov.nutrition.defense,
-                ),
+                nutrition=_nutrition_state(prov.nutrition),
                 fullness=prov.fullness,
                 caffeine=prov.caffeine,
             ))
+    return provision_items
 
-    # 作り置き料理
-    prepared_items = []
-    for prep in provisions.get_prepared(current_day):
-        prepared_items.append(PreparedItem(
+
+def _build_prepared_items(provisions, current_day: int) -> list[PreparedItem]:
+    """作り置き料理"""
+    return [
+        PreparedItem(
             name=prep.name,
             dish_type=prep.dish_type,
-            nutrition=NutritionState(
-                vitality=prep.nutrition.vitality,
-                mental=prep.nutrition.mental,
-                awakening=prep.nutrition.awakening,
-                sustain=prep.nutrition.sustain,
-                defense=prep.nutrition.defense,
-            ),
+            nutrition=_nutrition_state(prep.nutrition),
             fullness=prep.fullness,
             expiry_day=prep.expiry_day,
-        ))
+        )
+        for prep in provisions.get_prepared(current_day)
+    ]
+
 
-    # 配送待ち
-    pending_items = []
-    for pending in provisions.get_pending():
-        pending_items.append(PendingDeliveryItem(
+def _build_pending_items(provisions) -> list[PendingDeliveryItem]:
+    """配送待ち"""
+    return [
+        PendingDeliveryItem(
             item_type=pending.item_type,
             name=pending.name,
             quantity=pending.quantity,
             delivery_day=pending.delivery_day,
-        ))
+        )
+        for pending in provisions.get_pending()
+    ]
 
-    # 栄養状態
-    daily_nutr = day_state.daily_nutrition
-    daily_nutrition = NutritionState(
-        vitality=daily_nutr.vitality,
-        mental=daily_nutr.mental,
-        awakening=daily_nutr.awakening,
-        sustain=daily_nutr.sustain,
-        defense=daily_nutr.defense,
-    )
 
-    # フェーズ表示名
-    phase_names = {
-        GamePhase.BREAKFAST: "朝食",
-        GamePhase.GO_TO_WORK: "出勤",
-        GamePhase.LUNCH: "昼食",
-        GamePhase.LEAVE_WORK: "退勤",
-        GamePhase.SHOPPING: "買い出し",
-        GamePhase.HOLIDAY_SHOPPING_1: "買い出し（午前）",
-        GamePhase.HOLIDAY_LUNCH: "昼食",
-        GamePhase.HOLIDAY_SHOPPING_2: "買い出し（午後）",
-        GamePhase.DINNER: "夕食",
-        GamePhase.ONLINE_SHOPPING: "通販",
-        GamePhase.SLEEP: "就寝",
-        GamePhase.DAY_END: "1日終了",
-    }
+def _build_game_state(session_id: str, game) -> GameState:
+    """GameManagerからGameStateを構築
+
+    在庫・食糧・レリック・ボス・気質は、元の状態が前回から変わっていなければ
+    前回作った部品を使い回す（_state_part）。
+    """
+    player = game.player
+    day_state = game.day_state
+    stock = game.stock
+    provisions = game.provisions
+    relics = game.relics
+
+    current_day = day_state.day
+
+    stock_items = _state_part(
+        game, 'stock', (stock, stock.version, relics, relics.version, current_day),
+        lambda: _build_stock_items(stock, relics, current_day))
+    provision_items = _state_part(
+        game, 'provisions', (provisions, provisions.version),
+        lambda: _build_provision_items(provisions))
+    prepared_items = _state_part(
+        game, 'prepared', (provisions, provisions.version, current_day),
+        lambda: _build_prepared_items(provisions, current_day))
+    pending_items = _state_part(
+        game, 'pending', (provisions, provisions.version),
+        lambda: _build_pending_items(provisions))
+    relic_names = _state_part(
+        game, 'relics', (relics, relics.version), relics.get_all)
 
     # 体力警告チェック（アクション後に体力が0以下になるか）
     commute_will_cause_game_over = player.stamina <= COMMUTE_STAMINA_COST
@@ -175,7 +221,7 @@ def _build_game_state(session_id: str, game) -> GameState:
         day=day_state.day,
         month=day_state.month,
         phase=day_state.phase.name,
-        phase_display=phase_names.get(day_state.phase, day_state.phase.name),
+        phase_display=PHASE_NAMES.get(day_state.phase, day_state.phase.name),
         weather=game.get_weather_display(),
         is_holiday=game.is_holiday(),
         is_friday=game.is_friday(),
@@ -195,8 +241,8 @@ def _build_game_state(session_id: str, game) -> GameState:
         provisions=provision_items,
         prepared=prepared_items,
         pending_deliveries=pending_items,
-        relics=relics.get_all(),
-        daily_nutrition=daily_nutrition,
+        relics=relic_names,
+        daily_nutrition=_nutrition_state(day_state.daily_nutrition),
         caffeine=day_state.caffeine,
         is_game_over=game.is_game_over(),
         is_game_clear=game.is_game_complete(),
@@ -208,9 +254,11 @@ def _build_game_state(session_id: str, game) -> GameState:
         is_office_worker=game.character_id != 'freelance',
         commute_will_cause_game_over=commute_will_cause_game_over,
         shopping_will_cause_game_over=shopping_will_cause_game_over,
-        temperament=_build_temperament_info(game),
+        temperament=_state_part(
+            game, 'temperament', (game.temperament_id,), lambda: _build_temperament_info(game)),
         temperament_just_revealed=game.temperament_just_revealed,
-        current_boss=_build_boss_info(game),
+        current_boss=_state_part(
+            game, 'boss', (game.current_boss,), lambda: _build_boss_info(game)),
         should_show_boss_preview=game.should_show_boss_preview(),
     )
 
@@ -250,7 +298,10 @@ def _build_boss_info(game):
 
 
 def _get_game_or_404(session_id: str):
-    """セッションを取得、なければ404"""
+    """セッションを取得、なければ404（記録・リプレイ中の操作ではそのゲーム）"""
+    game = get_bound_game()
+    if game is not None:
+        return game
     game = get_session(session_id)
     if game is None:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -307,15 +358,31 @@ def start_game(request: StartGameRequest) -> StartGameResponse:
 
 
 @router.get("/game/{session_id}/state")
+@session_locked
 def get_game_state(session_id: str) -> GameState:
     """現在のゲーム状態を取得"""
     game = _get_game_or_404(session_id)
     return _build_game_state(session_id, game)
 
 
+@router.get("/game/{session_id}/action-log")
+@session_locked
+def get_game_action_log(session_id: str) -> ActionLogResponse:
+    """操作ログを取得（character_id・seedから始めて順に適用すると今の状態になる）"""
+    log = get_action_log(session_id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return ActionLogResponse(
+        character_id=log.character_id,
+        seed=log.seed,
+        actions=[ActionLogEntry(name=name, params=params) for name, params in log.actions],
+    )
+
+
 # === 買い物 ===
 
 @router.post("/game/{session_id}/go-shopping")
+@logged_action
 def go_shopping(session_id: str) -> GoShoppingResponse:
     """買い出しに行く（気力・体力を消費）"""
     game = _get_game_or_404(session_id)
@@ -346,6 +413,7 @@ def go_shopping(session_id: str) -> GoShoppingResponse:
 
 
 @router.get("/game/{session_id}/shop")
+@session_locked
 def get_shop(session_id: str, is_distant: bool = False) -> ShopResponse:
     """ショップ情報を取得
 
@@ -371,13 +439,7 @@ def get_shop(session_id: str, is_distant: bool = False) -> ShopResponse:
             price=item.price,
             quantity=5,  # 各商品5個まで購入可能
             is_sale=item.discount_type in ("sale", "near_expiry"),
-            nutrition=NutritionState(
-                vitality=ing.nutrition.vitality,
-                mental=ing.nutrition.mental,
-                awakening=ing.nutrition.awakening,
-                sustain=ing.nutrition.sustain,
-                defense=ing.nutrition.defense,
-            ),
+            nutrition=_nutrition_state(ing.nutrition),
             fullness=ing.fullness,
             expiry_days=item.freshness_days_left,
             is_distant_only=ing.distant_only,  # 限定フラグを追加
@@ -391,9 +453,14 @@ def get_shop(session_id: str, is_distant: bool = False) -> ShopResponse:
     ]
     suggestions = get_shop_recipe_suggestions(stock_ingredients, shop_items_for_suggestion)
 
+    # おすすめの買い物かご（バッグ容量・所持金・鮮度を考慮）
+    bag_capacity = game.get_bag_capacity()
+    basket = plan_basket(shop_items, game.stock, current_day, game.player.money, bag_capacity, game.relics)
+    prices = {item.ingredient.name: item.price for item in shop_items}
+
     return ShopResponse(
         items=items,
-        bag_capacity=game.get_bag_capacity(),
+        bag_capacity=bag_capacity,
         player_money=game.player.money,
         recipe_suggestions=[
             ShopRecipeSuggestionInfo(
@@ -404,10 +471,19 @@ def get_shop(session_id: str, is_distant: bool = False) -> ShopResponse:
             )
             for s in suggestions[:5]  # 上位5件まで
         ],
+        basket=ShopBasketInfo(
+            items=[
+                ShopBasketItemInfo(name=name, quantity=qty, price=prices[name])
+                for name, qty in basket.items
+            ],
+            total_cost=basket.total_cost,
+            total_units=basket.total_units,
+        ),
     )
 
 
 @router.post("/game/{session_id}/shop/buy")
+@logged_action
 def buy_from_shop(session_id: str, request: ShopBuyRequest) -> GameState:
     """ショップで購入"""
     game = _get_game_or_404(session_id)
@@ -465,6 +541,7 @@ def buy_from_shop(session_id: str, request: ShopBuyRequest) -> GameState:
 # === 通販 ===
 
 @router.get("/game/{session_id}/online-shop")
+@session_locked
 def get_online_shop(session_id: str) -> OnlineShopResponse:
     """通販情報を取得"""
     game = _get_game_or_404(session_id)
@@ -479,13 +556,7 @@ def get_online_shop(session_id: str) -> OnlineShopResponse:
             name=prov.name,
             price=prov.price,
             is_sale=False,  # TODO: セール処理
-            nutrition=NutritionState(
-                vitality=prov.nutrition.vitality,
-                mental=prov.nutrition.mental,
-                awakening=prov.nutrition.awakening,
-                sustain=prov.nutrition.sustain,
-                defense=prov.nutrition.defense,
-            ),
+            nutrition=_nutrition_state(prov.nutrition),
             fullness=prov.fullness,
             caffeine=prov.caffeine,
         ))
@@ -526,6 +597,7 @@ def get_online_shop(session_id: str) -> OnlineShopResponse:
 
 
 @router.post("/game/{session_id}/online-shop/buy")
+@logged_action
 def buy_from_online_shop(session_id: str, request: OnlineShopBuyRequest) -> GameState:
     """通販で購入（翌日配送、カード払い）"""
     game = _get_game_or_404(session_id)
@@ -567,15 +639,13 @@ def buy_from_online_shop(session_id: str, request: OnlineShopBuyRequest) -> Game
 # === 調理 ===
 
 @router.get("/game/{session_id}/recipes")
+@session_locked
 def get_recipes(session_id: str) -> RecipesResponse:
     """作成可能なネームド料理を取得"""
     game = _get_game_or_404(session_id)
-    current_day = game.day_state.day
-
-    # 利用可能な食材名リスト
-    available = game.stock.get_available_ingredients()
 
-    recipes = get_available_named_recipes(available)
+    # 在庫のある食材のビットマスクから判定
+    recipes = get_named_recipes_for_mask(game.stock.get_mask())
     return RecipesResponse(
         available=[
             NamedRecipeInfo(
@@ -590,73 +660,54 @@ def get_recipes(session_id: str) -> RecipesResponse:
     )
 
 
-@router.post("/game/{session_id}/cook/preview")
-def cook_preview(session_id: str, request: CookRequest) -> CookPreviewResponse:
-    """調理プレビュー（確認用）"""
-    from game.nutrition import Nutrition
-
+@router.get("/game/{session_id}/meal-plan")
+@session_locked
+def get_meal_plan(session_id: str, max_ingredients: int = 5, top_k: int = 3) -> MealPlanResponse:
+    """在庫からおすすめの料理の食材の組み合わせを取得"""
     game = _get_game_or_404(session_id)
 
-    if not request.ingredient_names:
-        raise HTTPException(status_code=400, detail="No ingredients selected")
+    if not 1 <= max_ingredients <= 8:
+        raise HTTPException(status_code=400, detail="max_ingredients must be between 1 and 8")
+    if not 1 <= top_k <= 10:
+        raise HTTPException(status_code=400, detail="top_k must be between 1 and 10")
+
+    # 今日の栄養の不足を埋め、今の満腹度で入る分を基準に探す
+    plans = plan_meal(
+        game.stock, game.day_state.day, game.relics,
+        meal_fullness=game.player.fullness,
+        daily_nutrition=game.day_state.daily_nutrition,
+        max_ingredients=max_ingredients,
+        top_k=top_k,
+    )
+    return MealPlanResponse(
+        plans=[
+            MealPlanInfo(
+                ingredients=plan.ingredients,
+                dish_name=plan.dish_name,
+                nutrition=_nutrition_state(plan.nutrition),
+                fullness=plan.fullness,
+                score=round(plan.score, 2),
+                is_named=plan.named_recipe_name is not None,
+                named_recipe_name=plan.named_recipe_name,
+                nutrition_good=plan.evaluation.nutrition_good,
+                fullness_good=plan.evaluation.fullness_good,
+            )
+            for plan in plans
+        ]
+    )
 
-    # 調理可能かチェック
-    can_make = game.can_cook() and not game.stock.is_empty()
 
-    # ネームド料理判定
-    named_recipe = find_named_recipe(request.ingredient_names)
+def _build_cook_preview(ingredient_names: list[str], prev_nutrition, meal_fullness: int,
+                        has_meal_nutrition: bool, dish_number: int, can_make: bool) -> CookPreviewResponse:
+    """1つの食材の組み合わせについて調理プレビューを作る（evaluate_cookingの結果から組み立てる）"""
+    evaluation = evaluate_cooking(ingredient_names, prev_nutrition, meal_fullness)
 
     # 料理名を決定
-    if named_recipe:
-        dish_name = named_recipe.name
+    if evaluation.named_recipe_name:
+        dish_name = evaluation.named_recipe_name
     else:
         # 適当な名前を生成
-        dish_name = "炒め物" if len(request.ingredient_names) > 1 else f"{request.ingredient_names[0]}料理"
-
-    # 栄養値を計算（プレビュー用）
-    from game.ingredients import get_ingredient
-    dish_nutrition = {"vitality": 0, "mental": 0, "awakening": 0, "sustain": 0, "defense": 0}
-    dish_fullness = 0
-
-    for name in request.ingredient_names:
-        ing = get_ingredient(name)
-        if ing:
-            dish_nutrition["vitality"] += ing.nutrition.vitality
-            dish_nutrition["mental"] += ing.nutrition.mental
-            dish_nutrition["awakening"] += ing.nutrition.awakening
-            dish_nutrition["sustain"] += ing.nutrition.sustain
-            dish_nutrition["defense"] += ing.nutrition.defense
-            dish_fullness += ing.fullness
-
-    # ネームド料理ボーナス
-    if named_recipe:
-        for key in dish_nutrition:
-            dish_nutrition[key] = int(dish_nutrition[key] * named_recipe.nutrition_multiplier)
-        dish_fullness += named_recipe.fullness_bonus
-
-    # 食事トータルを計算（累計 + この料理）
-    meal_nutrition = {**dish_nutrition}
-    meal_fullness = dish_fullness
-
-    if request.meal_nutrition:
-        meal_nutrition["vitality"] += request.meal_nutrition.vitality
-        meal_nutrition["mental"] += request.meal_nutrition.mental
-        meal_nutrition["awakening"] += request.meal_nutrition.awakening
-        meal_nutrition["sustain"] += request.meal_nutrition.sustain
-        meal_nutrition["defense"] += request.meal_nutrition.defense
-        meal_fullness += request.meal_fullness
-
-    # 調理評価（累計情報を使用してトータルで評価）
-    prev_nutrition = None
-    if request.meal_nutrition:
-        prev_nutrition = Nutrition(
-            vitality=request.meal_nutrition.vitality,
-            mental=request.meal_nutrition.mental,
-            awakening=request.meal_nutrition.awakening,
-            sustain=request.meal_nutrition.sustain,
-            defense=request.meal_nutrition.defense
-        )
-    evaluation = evaluate_cooking(request.ingredient_names, prev_nutrition, request.meal_fullness)
+        dish_name = "炒め物" if len(ingredient_names) > 1 else f"{ingredient_names[0]}料理"
 
     if evaluation.fullness_good and evaluation.nutrition_good:
         comment = "これなら腹いっぱいだし栄養もいいだろう！"
@@ -669,31 +720,87 @@ def cook_preview(session_id: str, request: CookRequest) -> CookPreviewResponse:
 
     return CookPreviewResponse(
         dish_name=dish_name,
-        nutrition=NutritionState(
-            vitality=dish_nutrition["vitality"],
-            mental=dish_nutrition["mental"],
-            awakening=dish_nutrition["awakening"],
-            sustain=dish_nutrition["sustain"],
-            defense=dish_nutrition["defense"],
-        ),
-        fullness=dish_fullness,
-        is_named=named_recipe is not None,
-        named_recipe_name=named_recipe.name if named_recipe else None,
+        nutrition=_nutrition_state(evaluation.dish_nutrition),
+        fullness=evaluation.dish_fullness,
+        is_named=evaluation.is_named,
+        named_recipe_name=evaluation.named_recipe_name,
         evaluation_comment=comment,
         can_make=can_make,
-        meal_nutrition=NutritionState(
-            vitality=meal_nutrition["vitality"],
-            mental=meal_nutrition["mental"],
-            awakening=meal_nutrition["awakening"],
-            sustain=meal_nutrition["sustain"],
-            defense=meal_nutrition["defense"],
-        ),
-        meal_fullness=meal_fullness,
-        dish_number=request.dish_number,
+        meal_nutrition=_nutrition_state(evaluation.meal_nutrition),
+        # 累計の満腹度は累計の栄養が渡されたときだけ足す
+        meal_fullness=evaluation.meal_fullness if has_meal_nutrition else evaluation.dish_fullness,
+        dish_number=dish_number,
+    )
+
+
+def _prev_meal_nutrition(meal_nutrition: NutritionState | None):
+    """リクエストの累計栄養をNutritionにする"""
+    from game.nutrition import Nutrition
+
+    if meal_nutrition is None:
+        return None
+    return Nutrition(
+        vitality=meal_nutrition.vitality,
+        mental=meal_nutrition.mental,
+        awakening=meal_nutrition.awakening,
+        sustain=meal_nutrition.sustain,
+        defense=meal_nutrition.defense
     )
 
 
+@router.post("/game/{session_id}/cook/preview")
+@session_locked
+def cook_preview(session_id: str, request: CookRequest) -> CookPreviewResponse:
+    """調理プレビュー（確認用）"""
+    game = _get_game_or_404(session_id)
+
+    if not request.ingredient_names:
+        raise HTTPException(status_code=400, detail="No ingredients selected")
+
+    # 調理可能かチェック
+    can_make = game.can_cook() and not game.stock.is_empty()
+
+    return _build_cook_preview(
+        request.ingredient_names,
+        _prev_meal_nutrition(request.meal_nutrition),
+        request.meal_fullness,
+        request.meal_nutrition is not None,
+        request.dish_number,
+        can_make,
+    )
+
+
+@router.post("/game/{session_id}/cook/preview/batch")
+@session_locked
+def cook_preview_batch(session_id: str, request: CookPreviewBatchRequest) -> CookPreviewBatchResponse:
+    """複数の食材の組み合わせの調理プレビューをまとめて取得（候補の順に返す）"""
+    game = _get_game_or_404(session_id)
+
+    if not request.candidates:
+        raise HTTPException(status_code=400, detail="No candidates given")
+    if len(request.candidates) > MAX_COOK_PREVIEW_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many candidates (max {MAX_COOK_PREVIEW_BATCH})")
+    if any(not names for names in request.candidates):
+        raise HTTPException(status_code=400, detail="No ingredients selected")
+
+    # セッション・累計栄養・調理可否は全候補で共通
+    can_make = game.can_cook() and not game.stock.is_empty()
+    prev_nutrition = _prev_meal_nutrition(request.meal_nutrition)
+
+    # 同じ組み合わせ（並び順も同じ）は1回だけ評価する
+    previews: dict[tuple[str, ...], CookPreviewResponse] = {}
+    for names in request.candidates:
+        key = tuple(names)
+        if key not in previews:
+            previews[key] = _build_cook_preview(
+                names, prev_nutrition, request.meal_fullness,
+                request.meal_nutrition is not None, request.dish_number, can_make)
+
+    return CookPreviewBatchResponse(previews=[previews[tuple(names)] for names in request.candidates])
+
+
 @router.post("/game/{session_id}/cook/confirm")
+@logged_action
 def cook_confirm(session_id: str, request: CookRequest) -> CookResponse:
     """調理を確定実行"""
     game = _get_game_or_404(session_id)
@@ -744,13 +851,7 @@ def cook_confirm(session_id: str, request: CookRequest) -> CookResponse:
 
     dish_info = DishInfo(
         name=dish.name,
-        nutrition=NutritionState(
-            vitality=dish.nutrition.vitality,
-            mental=dish.nutrition.mental,
-            awakening=dish.nutrition.awakening,
-            sustain=dish.nutrition.sustain,
-            defense=dish.nutrition.defense,
-        ),
+        nutrition=_nutrition_state(dish.nutrition),
         fullness=dish.fullness,
         ingredients=dish.ingredients_used,
         is_named=named_recipe is not None,
@@ -768,6 +869,7 @@ def cook_confirm(session_id: str, request: CookRequest) -> CookResponse:
 # === 食糧消費 ===
 
 @router.post("/game/{session_id}/eat-provision")
+@logged_action
 def eat_provision(session_id: str, request: EatProvisionRequest) -> GameState:
     """食糧を消費"""
     game = _get_game_or_404(session_id)
@@ -798,6 +900,7 @@ def eat_provision(session_id: str, request: EatProvisionRequest) -> GameState:
 
 
 @router.post("/game/{session_id}/eat-prepared")
+@logged_action
 def eat_prepared(session_id: str, prepared_index: int) -> GameState:
     """作り置き料理を食べる"""
     game = _get_game_or_404(session_id)
@@ -821,6 +924,7 @@ def eat_prepared(session_id: str, prepared_index: int) -> GameState:
 
 
 @router.post("/game/{session_id}/eat-cafeteria")
+@logged_action
 def eat_cafeteria(session_id: str) -> GameState:
     """社食を食べる（平日昼食用）"""
     game = _get_game_or_404(session_id)
@@ -847,6 +951,7 @@ def eat_cafeteria(session_id: str) -> GameState:
 
 
 @router.post("/game/{session_id}/eat-delivery")
+@logged_action
 def eat_delivery(session_id: str) -> GameState:
     """うぼあデリバリで食べる（フリーランス等の昼食用）"""
     game = _get_game_or_404(session_id)
@@ -873,6 +978,7 @@ def eat_delivery(session_id: str) -> GameState:
 
 
 @router.post("/game/{session_id}/make-bento")
+@logged_action
 def make_bento(session_id: str, request: MakeBentoRequest) -> MakeBentoResponse:
     """弁当を作成"""
     game = _get_game_or_404(session_id)
@@ -916,6 +1022,7 @@ def make_bento(session_id: str, request: MakeBentoRequest) -> MakeBentoResponse:
 # === フェーズ進行 ===
 
 @router.post("/game/{session_id}/advance-phase")
+@logged_action
 def advance_phase(session_id: str) -> AdvancePhaseResponse:
     """フェーズを進行"""
     game = _get_game_or_404(session_id)
@@ -987,7 +1094,7 @@ def advance_phase(session_id: str) -> AdvancePhaseResponse:
             has_insomnia = game.sleep()
 
             # ねぎらいメッセージをランダム選択
-            encouragement_message = random.choice(ENCOURAGEMENT_MESSAGES)
+            encouragement_message = game.rng.choice(ENCOURAGEMENT_MESSAGES)
 
             game.start_new_day()
 
@@ -1030,6 +1137,7 @@ def advance_phase(session_id: str) -> AdvancePhaseResponse:
 # === ボス関連 ===
 
 @router.post("/game/{session_id}/boss-preview-shown")
+@logged_action
 def mark_boss_preview_shown(session_id: str) -> GameState:
     """ボス予告を表示済みにする"""
     game = _get_game_or_404(session_id)
@@ -1040,6 +1148,7 @@ def mark_boss_preview_shown(session_id: str) -> GameState:
 # === 休日アクション ===
 
 @router.post("/game/{session_id}/holiday-action")
+@logged_action
 def holiday_action(session_id: str, request: HolidayActionRequest) -> GameState:
     """休日アクションを実行"""
     game = _get_game_or_404(session_id)
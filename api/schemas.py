@@ -1,6 +1,6 @@
 """Pydanticスキーマ定義"""
 from __future__ import annotations
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 # === リクエストスキーマ ===
@@ -17,6 +17,14 @@ class CookRequest(BaseModel):
     dish_number: int = 1
 
 
+class CookPreviewBatchRequest(BaseModel):
+    candidates: list[list[str]]  # 食材の組み合わせの候補
+    # 複数料理時の累計（全候補で共通、オプション）
+    meal_nutrition: NutritionState | None = None
+    meal_fullness: int = 0
+    dish_number: int = 1
+
+
 class ShopBuyRequest(BaseModel):
     items: list[dict]  # [{ingredient_name: str, quantity: int}]
     is_distant: bool = False  # 遠くのスーパーからの購入かどうか
@@ -43,6 +51,8 @@ class MakeBentoRequest(BaseModel):
 # === レスポンススキーマ ===
 
 class NutritionState(BaseModel):
+    model_config = ConfigDict(frozen=True)  # StockItemの中でセッションをまたいで共有する
+
     vitality: int
     mental: int
     awakening: int
@@ -62,6 +72,9 @@ class PlayerState(BaseModel):
 
 
 class StockItem(BaseModel):
+    # routes._stock_item がセッションをまたいで使い回すので書き換えられないようにする
+    model_config = ConfigDict(frozen=True)
+
     name: str
     category: str
     quantity: int
@@ -264,11 +277,25 @@ class ShopRecipeSuggestionInfo(BaseModel):
     total_cost: int
 
 
+class ShopBasketItemInfo(BaseModel):
+    name: str
+    quantity: int
+    price: int  # 単価
+
+
+class ShopBasketInfo(BaseModel):
+    """おすすめの買い物かご（バッグ容量と所持金の範囲で最適化）"""
+    items: list[ShopBasketItemInfo]
+    total_cost: int
+    total_units: int
+
+
 class ShopResponse(BaseModel):
     items: list[ShopItemInfo]
     bag_capacity: int
     player_money: int
     recipe_suggestions: list[ShopRecipeSuggestionInfo] = []
+    basket: ShopBasketInfo | None = None
 
 
 class OnlineProvisionInfo(BaseModel):
@@ -310,6 +337,22 @@ class RecipesResponse(BaseModel):
     available: list[NamedRecipeInfo]
 
 
+class MealPlanInfo(BaseModel):
+    ingredients: list[str]
+    dish_name: str
+    nutrition: NutritionState  # 鮮度補正・レリック効果込みの栄養
+    fullness: int
+    score: float
+    is_named: bool
+    named_recipe_name: str | None = None
+    nutrition_good: bool
+    fullness_good: bool
+
+
+class MealPlanResponse(BaseModel):
+    plans: list[MealPlanInfo]  # 評価値の高い順
+
+
 class CookResponse(BaseModel):
     dish: DishInfo
     state: GameState
@@ -331,6 +374,10 @@ class CookPreviewResponse(BaseModel):
     dish_number: int                # 何品目か
 
 
+class CookPreviewBatchResponse(BaseModel):
+    previews: list[CookPreviewResponse]  # candidatesと同じ順
+
+
 class MakeBentoResponse(BaseModel):
     bento_name: str
     state: GameState
@@ -342,6 +389,17 @@ class GoShoppingResponse(BaseModel):
     auto_consume: AutoConsumeInfo | None = None
 
 
+class ActionLogEntry(BaseModel):
+    name: str     # エンドポイント名（ハンドラ関数名）
+    params: dict  # パラメータ（リクエストボディはdictにしたもの）
+
+
+class ActionLogResponse(BaseModel):
+    character_id: str
+    seed: int  # GameManagerの乱数シード
+    actions: list[ActionLogEntry]  # 適用順
+
+
 class AdvancePhaseResponse(BaseModel):
     events: list[EventInfo]
     state: GameState
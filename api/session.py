@@ -1,6 +1,33 @@
-"""ゲームセッション管理"""
+"""ゲームセッション管理
+
+セッションの保存先は SessionStore で差し替えられる。
+- MemorySessionStore: プロセス内の辞書（デフォルト）
+- SQLiteSessionStore: SQLite（WALモード）に、GameManagerのスナップショット（game/snapshot.py）と
+  操作ログ（api/action_log.py）を保存する。操作はリクエストごとに1行追記し、スナップショットは
+  SNAPSHOT_INTERVAL 操作ごとに取り直す。読み込みはスナップショット + それ以降の操作のリプレイ。
+  同じホストで複数のuvicornワーカーを動かしても、どのワーカーからでも同じセッションを引ける
+環境変数 COOKING_SIM_SESSION_DB にDBファイルのパスを指定するとSQLiteを使う。
+
+どちらのストアも次の上限を持つ。
+- 最後のアクセスから SESSION_IDLE_TTL_SECONDS 秒たったセッションは削除（TTL）
+- セッション数が MAX_SESSIONS を超えたら、最も長くアクセスのないものから削除（LRU）
+TTL切れはアクセス時にも判定し、start_session_sweeper() のバックグラウンドスレッドが
+定期的にまとめて掃除する。削除した数は理由ごとに get_eviction_counts() で取れる。
+
+ルートハンドラはスレッドプールで並行に動くので、同じセッションへのリクエストは session_lock() で
+1つずつ処理する（別のセッションは並行に進む）。ロック待ちの時間は get_lock_wait_stats() で取れる。
+"""
+import functools
+import os
+import secrets
+import sqlite3
+import threading
+import time
 import uuid
-from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterator
 
 import sys
 from pathlib import Path
@@ -10,23 +37,636 @@ from game.player import Player
 from game.ingredients import create_initial_stock
 from game.day_cycle import GameManager
 from game.character import get_character, get_default_character
+from game.snapshot import restore, snapshot
+
+from .action_log import ActionLog, decode_action
 
 if TYPE_CHECKING:
     from game.day_cycle import GameManager
 
 
-# インメモリセッションストア
-_sessions: dict[str, GameManager] = {}
+SESSION_IDLE_TTL_SECONDS = 6 * 60 * 60  # 最後のアクセスからこの秒数で削除（Noneなら無期限）
+MAX_SESSIONS = 1000                     # 保持するセッション数の上限（Noneなら無制限）
+SESSION_SWEEP_INTERVAL_SECONDS = 60     # バックグラウンド掃除の間隔
+SESSION_CACHE_SIZE = 256                # SQLiteストアがプロセス内に持つセッション数
+SNAPSHOT_INTERVAL = 20                  # SQLiteストアがスナップショットを取り直す操作数
+SESSION_DB_ENV = "COOKING_SIM_SESSION_DB"  # SQLiteのDBファイルのパスを指定する環境変数
 
 
-def create_session(character_id: str | None = None) -> tuple[str, GameManager]:
-    """新しいゲームセッションを作成
+# === セッションごとのロック ===
 
-    Args:
-        character_id: キャラクターID（省略時はデフォルト）
+class _SessionLock:
+    """セッション1つ分のロック（使うスレッドがいなくなったら _session_locks から外す）"""
+    __slots__ = ('lock', 'users')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+_session_locks: dict[str, _SessionLock] = {}
+_session_locks_guard = threading.Lock()  # _session_locks と _lock_wait_stats を守る
+_lock_wait_stats = {'acquired': 0, 'contended': 0, 'total_wait_ms': 0.0, 'max_wait_ms': 0.0}
+
+
+def _checkout_lock(session_id: str) -> _SessionLock:
+    with _session_locks_guard:
+        entry = _session_locks.get(session_id)
+        if entry is None:
+            entry = _session_locks[session_id] = _SessionLock()
+        entry.users += 1
+        return entry
+
+
+def _return_lock(session_id: str, entry: _SessionLock):
+    with _session_locks_guard:
+        entry.users -= 1
+        if entry.users == 0:
+            del _session_locks[session_id]
+
+
+@contextmanager
+def session_lock(session_id: str) -> Iterator[None]:
+    """セッションのロックを取る（同じセッションへのリクエストを1つずつ処理する）
+
+    別のセッションのロックとは独立。待った時間は get_lock_wait_stats() に足す。
+    プロセス内のロックなので、複数ワーカー間の整合はSQLiteストアのversionと操作ログで取る。
+    """
+    entry = _checkout_lock(session_id)
+    start = time.perf_counter()
+    contended = not entry.lock.acquire(blocking=False)
+    if contended:
+        entry.lock.acquire()
+    wait_ms = (time.perf_counter() - start) * 1000
+    with _session_locks_guard:
+        _lock_wait_stats['acquired'] += 1
+        if contended:
+            _lock_wait_stats['contended'] += 1
+            _lock_wait_stats['total_wait_ms'] += wait_ms
+            _lock_wait_stats['max_wait_ms'] = max(_lock_wait_stats['max_wait_ms'], wait_ms)
+    try:
+        yield
+    finally:
+        entry.lock.release()
+        _return_lock(session_id, entry)
+
+
+@contextmanager
+def try_session_lock(session_id: str) -> Iterator[bool]:
+    """空いていればセッションのロックを取る（yieldするのは取れたかどうか、待たない）"""
+    entry = _checkout_lock(session_id)
+    locked = entry.lock.acquire(blocking=False)
+    try:
+        yield locked
+    finally:
+        if locked:
+            entry.lock.release()
+        _return_lock(session_id, entry)
+
+
+def session_locked(handler: Callable) -> Callable:
+    """session_id を取るルートハンドラをセッションのロックの中で実行する（読み取り用）
+
+    セッションを変更するハンドラには action_log.logged_action を使う（同じロックを取る）。
+    """
+    @functools.wraps(handler)
+    def wrapper(session_id: str, **kwargs):
+        with session_lock(session_id):
+            return handler(session_id, **kwargs)
+
+    return wrapper
+
+
+def get_lock_wait_stats() -> dict:
+    """セッションのロック待ちの統計
+
+    acquired: ロックを取った回数, contended: そのうち待った回数,
+    total_wait_ms / max_wait_ms: 待った時間の合計・最大（ミリ秒）
+    """
+    with _session_locks_guard:
+        stats = dict(_lock_wait_stats)
+    stats['total_wait_ms'] = round(stats['total_wait_ms'], 3)
+    stats['max_wait_ms'] = round(stats['max_wait_ms'], 3)
+    return stats
+
+
+class SessionStore(ABC):
+    """セッションの保存先（抽象基底クラス。@abstractmethod をすべて実装しないと作れない）
+
+    idle_ttl_seconds / max_sessions は configure_sessions() で変更できる。
+    """
+
+    def __init__(self, idle_ttl_seconds: float | None = SESSION_IDLE_TTL_SECONDS,
+                 max_sessions: int | None = MAX_SESSIONS):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        # 削除理由ごとの件数
+        self._eviction_counts = {'ttl': 0, 'lru': 0}
+
+    @abstractmethod
+    def add(self, session_id: str, game: GameManager, seed: int):
+        """セッションを保存する（seedはGameManagerの乱数シード、操作ログの起点）"""
+
+    @abstractmethod
+    def record_action(self, session_id: str, action: bytes, expected_version: int) -> bool:
+        """操作ログに1件追記する（action は action_log.encode_action の結果）
+
+        expected_version は操作を適用したGameManagerを get_with_version() で取ったときのversion。
+        その後に別のワーカーが操作していたら（versionが違えば）記録せずにFalseを返す。
+        """
+
+    @abstractmethod
+    def get_action_log(self, session_id: str) -> ActionLog | None:
+        """セッションの操作ログ（なければNone）"""
+
+    @abstractmethod
+    def get_with_version(self, session_id: str) -> tuple[GameManager, int] | None:
+        """セッションと、それに適用済みの操作数（version）を取得する（TTL切れなら削除してNone）"""
+
+    def get(self, session_id: str) -> GameManager | None:
+        """セッションを取得する（TTL切れなら削除してNone）"""
+        loaded = self.get_with_version(session_id)
+        return loaded[0] if loaded is not None else None
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """セッションを削除する（あればTrue）"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """保存しているセッション数"""
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """TTL切れと上限超過のセッションをまとめて削除し、削除した件数を返す"""
+
+    def compact(self, session_id: str):
+        """操作がたまったセッションのスナップショットを取り直す（不要なストアでは何もしない）
+
+        操作は record_action で記録済みなので、これは読み込みを速くするためだけのもの。
+        セッションのロックを取った状態で呼ぶ。
+        """
+
+    def close(self):
+        """ストアを閉じる"""
+
+    def eviction_counts(self) -> dict[str, int]:
+        """削除理由ごとの件数"""
+        with self._lock:
+            return dict(self._eviction_counts)
+
+
+class MemorySessionStore(SessionStore):
+    """プロセス内の辞書に置くストア（最後にアクセスした順、古いものが先頭）"""
+
+    def __init__(self, idle_ttl_seconds: float | None = SESSION_IDLE_TTL_SECONDS,
+                 max_sessions: int | None = MAX_SESSIONS):
+        super().__init__(idle_ttl_seconds, max_sessions)
+        self._sessions: OrderedDict[str, GameManager] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        # セッションID → (キャラクターID, 乱数シード, [操作, ...])
+        self._logs: dict[str, tuple[str, int, list[bytes]]] = {}
+
+    def _remove(self, session_id: str):
+        """セッションと操作ログを削除する（_lockを取った状態で呼ぶ）"""
+        del self._sessions[session_id]
+        del self._last_access[session_id]
+        del self._logs[session_id]
+
+    def _evict(self, session_id: str, reason: str):
+        """セッションを削除して件数を数える（_lockを取った状態で呼ぶ）"""
+        self._remove(session_id)
+        self._eviction_counts[reason] += 1
+
+    def _evict_over_capacity(self) -> int:
+        """上限を超えた分を古い順に削除する（_lockを取った状態で呼ぶ）"""
+        if self.max_sessions is None:
+            return 0
+        evicted = 0
+        while len(self._sessions) > self.max_sessions:
+            self._evict(next(iter(self._sessions)), 'lru')
+            evicted += 1
+        return evicted
+
+    def _is_expired(self, session_id: str, now: float) -> bool:
+        return (self.idle_ttl_seconds is not None
+                and now - self._last_access[session_id] >= self.idle_ttl_seconds)
+
+    def add(self, session_id: str, game: GameManager, seed: int):
+        with self._lock:
+            self._sessions[session_id] = game
+            self._last_access[session_id] = time.monotonic()
+            self._logs[session_id] = (game.character_id, seed, [])
+            self._evict_over_capacity()
+
+    def record_action(self, session_id: str, action: bytes, expected_version: int) -> bool:
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is None or len(log[2]) != expected_version:
+                return False
+            log[2].append(action)
+            return True
+
+    def get_action_log(self, session_id: str) -> ActionLog | None:
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is None:
+                return None
+            character_id, seed, actions = log
+            return ActionLog(character_id, seed, [decode_action(action) for action in actions])
+
+    def get_with_version(self, session_id: str) -> tuple[GameManager, int] | None:
+        now = time.monotonic()
+        with self._lock:
+            game = self._sessions.get(session_id)
+            if game is None:
+                return None
+            if self._is_expired(session_id, now):
+                self._evict(session_id, 'ttl')
+                return None
+            self._sessions.move_to_end(session_id)
+            self._last_access[session_id] = now
+            return game, len(self._logs[session_id][2])
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._sessions:
+                self._remove(session_id)
+                return True
+        return False
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def sweep(self) -> int:
+        """アクセス順に並んでいるので、先頭からTTL切れでないものに当たるまで見れば足りる"""
+        now = time.monotonic()
+        evicted = 0
+        with self._lock:
+            evicted += self._evict_over_capacity()
+            if self.idle_ttl_seconds is None:
+                return evicted
+            while self._sessions:
+                session_id = next(iter(self._sessions))
+                if not self._is_expired(session_id, now):
+                    break
+                self._evict(session_id, 'ttl')
+                evicted += 1
+        return evicted
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite（WALモード）に保存するストア
+
+    - sessions（id, character_id, seed, state, action_seq, version, last_access）:
+      state は action_seq 件目までの操作を適用したスナップショット、version はこれまでの操作数
+    - session_actions（session_id, seq, action）: 操作ログ（seqは1から）
+    get() はDBの version を見て、キャッシュと同じならキャッシュを返す。違えば（未キャッシュか、
+    他のワーカーが操作した）スナップショットを読んで action_seq より後の操作をリプレイする。
+    スナップショットが読めなければ（スキーマが変わった・壊れた）操作ログを最初からリプレイする。
+    record_action() は1つのトランザクション（BEGIN IMMEDIATE）で、version が get 時のままなら
+    version を上げて操作を1行追記する。別のワーカーが先に進めていたら記録せず、キャッシュを捨てる。
+    スナップショットは記録に成功した操作の後に compact() が SNAPSHOT_INTERVAL 操作ごとに取り直す
+    （途中でプロセスが落ちても操作ログから復元できる）。
+    last_access はワーカー間で比べるので壁時計（time.time()）を使う。
+    """
+
+    def __init__(self, path: str | Path,
+                 idle_ttl_seconds: float | None = SESSION_IDLE_TTL_SECONDS,
+                 max_sessions: int | None = MAX_SESSIONS,
+                 cache_size: int = SESSION_CACHE_SIZE,
+                 snapshot_interval: int = SNAPSHOT_INTERVAL):
+        super().__init__(idle_ttl_seconds, max_sessions)
+        self.path = str(path)
+        self.cache_size = cache_size
+        self.snapshot_interval = snapshot_interval
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " id TEXT PRIMARY KEY,"
+            " character_id TEXT NOT NULL,"
+            " seed INTEGER NOT NULL,"
+            " state BLOB NOT NULL,"
+            " action_seq INTEGER NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_actions ("
+            " session_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " action BLOB NOT NULL,"
+            " PRIMARY KEY (session_id, seq))"
+        )
+        # セッションID → (GameManager, 適用済みの操作数, スナップショットに含まれる操作数)  最後にアクセスした順
+        self._cache: OrderedDict[str, tuple[GameManager, int, int]] = OrderedDict()
+
+    def _cache_put(self, session_id: str, game: GameManager, version: int, action_seq: int):
+        """キャッシュに入れる（_lockを取った状態で呼ぶ）"""
+        self._cache[session_id] = (game, version, action_seq)
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.cache_size:
+            oldest = next(iter(self._cache))
+            self._snapshot_if_idle(oldest, 1)  # 外す前にスナップショットを取っておく
+            del self._cache[oldest]
+
+    def _delete_row(self, session_id: str) -> bool:
+        """セッションと操作ログを削除する（_lockを取った状態で呼ぶ）"""
+        self._cache.pop(session_id, None)
+        self._conn.execute("DELETE FROM session_actions WHERE session_id = ?", (session_id,))
+        return self._conn.execute(
+            "DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def _evict_over_capacity(self) -> int:
+        """上限を超えた分を last_access の古い順に削除する（_lockを取った状態で呼ぶ）"""
+        if self.max_sessions is None:
+            return 0
+        rows = self._conn.execute(
+            "SELECT id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?",
+            (self.max_sessions,),
+        ).fetchall()
+        for (session_id,) in rows:
+            self._delete_row(session_id)
+            self._eviction_counts['lru'] += 1
+        return len(rows)
+
+    def _write_snapshot(self, session_id: str):
+        """キャッシュのGameManagerのスナップショットを書く（_lockを取った状態で呼ぶ）"""
+        game, version, _ = self._cache[session_id]
+        self._conn.execute(
+            "UPDATE sessions SET state = ?, action_seq = ? WHERE id = ? AND version = ?",
+            (snapshot(game), version, session_id, version),
+        )
+        self._cache[session_id] = (game, version, version)
+
+    def _snapshot_if_idle(self, session_id: str, min_actions: int):
+        """min_actions 操作以上たまっていて、処理中のリクエストがなければスナップショットを書く
+
+        処理中（セッションのロックが取られている）なら書きかけの状態になりうるので飛ばす。
+        飛ばしても操作ログから復元できる（_lockを取った状態で呼ぶ）。
+        """
+        _, version, action_seq = self._cache[session_id]
+        if version - action_seq < min_actions:
+            return
+        with try_session_lock(session_id) as locked:
+            if locked:
+                self._write_snapshot(session_id)
+
+    def _load(self, session_id: str) -> tuple[GameManager, int, int]:
+        """スナップショット + それ以降の操作のリプレイで作り直す（_lockを取った状態で呼ぶ）
+
+        スナップショットが読めない（形式・スキーマが変わった、壊れている）ときは、
+        character_id・seed と全操作から最初から作り直し、スナップショットを書き直す。
+        """
+        from .action_log import replay_actions
+
+        character_id, seed, state, action_seq, version = self._conn.execute(
+            "SELECT character_id, seed, state, action_seq, version FROM sessions WHERE id = ?",
+            (session_id,),
+        ).fetchone()
+        try:
+            game = restore(state)
+        except ValueError:
+            game = None
+            action_seq = 0
+        actions = self._conn.execute(
+            "SELECT action FROM session_actions WHERE session_id = ? AND seq > ? AND seq <= ?"
+            " ORDER BY seq",
+            (session_id, action_seq, version),
+        ).fetchall()
+        actions = [decode_action(action) for (action,) in actions]
+        if game is not None:
+            return replay_actions(game, actions), version, action_seq
+
+        game = replay_actions(new_game(character_id, seed), actions)
+        self._conn.execute(
+            "UPDATE sessions SET state = ?, action_seq = ? WHERE id = ? AND version = ?",
+            (snapshot(game), version, session_id, version),
+        )
+        return game, version, version
+
+    def add(self, session_id: str, game: GameManager, seed: int):
+        state = snapshot(game)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (id, character_id, seed, state, action_seq, version, last_access)"
+                " VALUES (?, ?, ?, ?, 0, 0, ?)",
+                (session_id, game.character_id, seed, state, time.time()),
+            )
+            self._cache_put(session_id, game, 0, 0)
+            self._evict_over_capacity()
+
+    def record_action(self, session_id: str, action: bytes, expected_version: int) -> bool:
+        version = expected_version + 1
+        with self._lock:
+            # versionの確認・更新と操作の追記を1つのトランザクションで行う（BEGIN IMMEDIATEで書き込みを直列化）
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = self._conn.execute(
+                    "UPDATE sessions SET version = ?, last_access = ? WHERE id = ? AND version = ?",
+                    (version, time.time(), session_id, expected_version),
+                ).rowcount
+                if updated:
+                    self._conn.execute(
+                        "INSERT INTO session_actions (session_id, seq, action) VALUES (?, ?, ?)",
+                        (session_id, version, action),
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+            cached = self._cache.get(session_id)
+            if updated and cached is not None and cached[1] == expected_version:
+                self._cache[session_id] = (cached[0], version, cached[2])
+            else:
+                # 他のワーカーが先に操作した（キャッシュのGameManagerは古い状態に適用したもの）。
+                # 次のget()で読み直す
+                self._cache.pop(session_id, None)
+            return bool(updated)
+
+    def get_action_log(self, session_id: str) -> ActionLog | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT character_id, seed, version FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            character_id, seed, version = row
+            actions = self._conn.execute(
+                "SELECT action FROM session_actions WHERE session_id = ? AND seq <= ? ORDER BY seq",
+                (session_id, version),
+            ).fetchall()
+        return ActionLog(character_id, seed, [decode_action(action) for (action,) in actions])
+
+    def get_with_version(self, session_id: str) -> tuple[GameManager, int] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, last_access FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                self._cache.pop(session_id, None)
+                return None
+            version, last_access = row
+            if self.idle_ttl_seconds is not None and now - last_access >= self.idle_ttl_seconds:
+                self._delete_row(session_id)
+                self._eviction_counts['ttl'] += 1
+                return None
+
+            cached = self._cache.get(session_id)
+            if cached is not None and cached[1] == version:
+                game = cached[0]
+                self._cache.move_to_end(session_id)
+            else:
+                # 未キャッシュか、他のワーカーが操作した
+                game, version, action_seq = self._load(session_id)
+                self._cache_put(session_id, game, version, action_seq)
+            self._conn.execute(
+                "UPDATE sessions SET last_access = ? WHERE id = ?", (now, session_id))
+            return game, version
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._delete_row(session_id)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def sweep(self) -> int:
+        with self._lock:
+            evicted = self._evict_over_capacity()
+            if self.idle_ttl_seconds is None:
+                return evicted
+            cutoff = time.time() - self.idle_ttl_seconds
+            expired = self._conn.execute(
+                "SELECT id FROM sessions WHERE last_access <= ?", (cutoff,)).fetchall()
+            for (session_id,) in expired:
+                self._delete_row(session_id)
+                self._eviction_counts['ttl'] += 1
+            return evicted + len(expired)
+
+    def compact(self, session_id: str):
+        """スナップショットの後に SNAPSHOT_INTERVAL 操作以上たまっていれば取り直す"""
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached is not None and cached[1] - cached[2] >= self.snapshot_interval:
+                self._write_snapshot(session_id)
+
+    def close(self):
+        with self._lock:
+            for session_id in list(self._cache):
+                self._snapshot_if_idle(session_id, 1)
+            self._conn.close()
+
+
+def _create_default_store() -> SessionStore:
+    """環境変数 COOKING_SIM_SESSION_DB があればSQLite、なければメモリのストアを作る"""
+    path = os.environ.get(SESSION_DB_ENV)
+    if path:
+        return SQLiteSessionStore(path)
+    return MemorySessionStore()
+
+
+_store: SessionStore = _create_default_store()
+
+_sweeper_thread: threading.Thread | None = None
+_sweeper_stop = threading.Event()
+
+
+def get_session_store() -> SessionStore:
+    """現在のセッションストアを取得"""
+    return _store
+
+
+def set_session_store(store: SessionStore) -> SessionStore:
+    """セッションストアを差し替える（前のストアは閉じる）
 
     Returns:
-        (session_id, GameManager)
+        新しいストア
+    """
+    global _store
+    previous, _store = _store, store
+    if previous is not store:
+        previous.close()
+    return store
+
+
+def configure_sessions(idle_ttl_seconds: float | None, max_sessions: int | None):
+    """TTLとセッション数の上限を設定する（上限を下げた場合は超えた分をすぐ削除）"""
+    global SESSION_IDLE_TTL_SECONDS, MAX_SESSIONS
+    SESSION_IDLE_TTL_SECONDS = idle_ttl_seconds
+    MAX_SESSIONS = max_sessions
+    _store.idle_ttl_seconds = idle_ttl_seconds
+    _store.max_sessions = max_sessions
+    _store.sweep()
+
+
+def sweep_expired_sessions() -> int:
+    """TTL切れと上限超過のセッションをまとめて削除する
+
+    Returns:
+        削除した件数
+    """
+    return _store.sweep()
+
+
+def compact_session(session_id: str):
+    """操作がたまったセッションのスナップショットを取り直す（action_log.logged_actionが記録の後に呼ぶ）"""
+    _store.compact(session_id)
+
+
+def record_action(session_id: str, action: bytes, expected_version: int) -> bool:
+    """セッションの操作ログに1件追記する（action_log.logged_actionから呼ばれる）
+
+    expected_version から別のワーカーが操作を進めていたら記録せずにFalse。
+    """
+    return _store.record_action(session_id, action, expected_version)
+
+
+def get_action_log(session_id: str) -> ActionLog | None:
+    """セッションの操作ログを取得（なければNone）"""
+    return _store.get_action_log(session_id)
+
+
+def _sweep_loop(interval: float):
+    while not _sweeper_stop.wait(interval):
+        sweep_expired_sessions()
+
+
+def start_session_sweeper(interval: float = SESSION_SWEEP_INTERVAL_SECONDS):
+    """TTL切れのセッションを定期的に削除するバックグラウンドスレッドを開始する（起動済みなら何もしない）"""
+    global _sweeper_thread
+    if _sweeper_thread is not None and _sweeper_thread.is_alive():
+        return
+    _sweeper_stop.clear()
+    _sweeper_thread = threading.Thread(
+        target=_sweep_loop, args=(interval,), name="session-sweeper", daemon=True)
+    _sweeper_thread.start()
+
+
+def stop_session_sweeper():
+    """バックグラウンド掃除スレッドを止める"""
+    global _sweeper_thread
+    _sweeper_stop.set()
+    if _sweeper_thread is not None:
+        _sweeper_thread.join()
+        _sweeper_thread = None
+
+
+def new_game(character_id: str | None, seed: int) -> GameManager:
+    """キャラクター設定を反映したGameManagerを作る（同じ引数なら同じ初期状態）
+
+    Args:
+        character_id: キャラクターID（省略時・未知ならデフォルト）
+        seed: GameManagerの乱数シード
     """
     # キャラクター取得
     if character_id:
@@ -54,14 +694,31 @@ def create_session(character_id: str | None = None) -> tuple[str, GameManager]:
         bonus_amount=character.bonus_amount,
         rent_amount=character.rent_amount,
         character_id=character.id,
+        seed=seed,
     )
 
     # 天気を決定（1日目開始時）
     game.determine_weather()
+    return game
+
+
+def create_session(character_id: str | None = None) -> tuple[str, GameManager]:
+    """新しいゲームセッションを作成
+
+    乱数シードはセッションごとにランダムに決め、操作ログと一緒に保存する。
+
+    Args:
+        character_id: キャラクターID（省略時はデフォルト）
+
+    Returns:
+        (session_id, GameManager)
+    """
+    seed = secrets.randbits(63)
+    game = new_game(character_id, seed)
 
     # セッションID生成・保存
     session_id = str(uuid.uuid4())
-    _sessions[session_id] = game
+    _store.add(session_id, game, seed)
 
     return session_id, game
 
@@ -73,9 +730,14 @@ def get_session(session_id: str) -> GameManager | None:
         session_id: セッションID
 
     Returns:
-        GameManager or None
+        GameManager or None（TTL切れなら削除してNone）
     """
-    return _sessions.get(session_id)
+    return _store.get(session_id)
+
+
+def get_session_with_version(session_id: str) -> tuple[GameManager, int] | None:
+    """セッションと、それに適用済みの操作数（version）を取得（なければNone）"""
+    return _store.get_with_version(session_id)
 
 
 def delete_session(session_id: str) -> bool:
@@ -87,12 +749,14 @@ def delete_session(session_id: str) -> bool:
     Returns:
         削除成功時True
     """
-    if session_id in _sessions:
-        del _sessions[session_id]
-        return True
-    return False
+    return _store.delete(session_id)
 
 
 def get_session_count() -> int:
     """アクティブセッション数を取得"""
-    return len(_sessions)
+    return _store.count()
+
+
+def get_eviction_counts() -> dict[str, int]:
+    """削除理由ごとのセッション削除数を取得（ttl: 無操作で期限切れ, lru: 上限超過）"""
+    return _store.eviction_counts()
@@ -10,7 +10,7 @@ from .result import GameStats, GameResult
 from .relic import RelicInventory
 from .provisions import ProvisionStock
 from .events import EventManager
-from .event_data import register_all_events
+from .event_data import EVENT_REGISTRY
 from .character import get_character
 from .temperament import BehaviorTracker, get_temperament, calculate_nutrition_balance
 from .weekly_boss import WeeklyBoss, select_weekly_boss, get_week_number
@@ -258,17 +258,19 @@ class GameManager:
                  bonus_amount: int | None = None,
                  rent_amount: int = 0,
                  with_initial_relics: bool = True,
-                 character_id: str = 'regular'):
+                 character_id: str = 'regular',
+                 seed: int | None = None):
         self.player = player
         self.stock = stock
         self.character_id = character_id  # キャラクターID
-        self.session_seed = random.randint(0, 1000000)  # セッション固有のランダムシード
+        # セッション固有の乱数（イベント判定などはすべてここから引く。seed指定で再現可能）
+        self.rng = random.Random(seed)
+        self.session_seed = self.rng.randint(0, 1000000)  # セッション固有のランダムシード
         self.day_state = DayState()
         self.stats = GameStats()  # 統計収集用
         self.relics = RelicInventory()  # レリック所持
         self.provisions = ProvisionStock()  # 食糧ストック
-        self.events = EventManager()  # イベント管理
-        register_all_events(self.events)  # 全イベントを登録
+        self.events = EventManager(rng=self.rng, registry=EVENT_REGISTRY)  # イベント管理（定義は全セッション共有）
         self.has_bonus = has_bonus  # ボーナスの有無（キャラ設定用）
         self.nutrition_streak = NutritionStreak()  # 栄養素連続高値トラッキング
         self.behavior_tracker = BehaviorTracker()  # 行動トラッカー（気質判定用）
@@ -278,7 +280,7 @@ class GameManager:
         self.temperament_id: str | None = None  # 判定された気質ID
         self.temperament_just_revealed: bool = False  # 気質が今発表されたかどうか
         # 週間ボス関連
-        self.current_boss: WeeklyBoss | None = select_weekly_boss(1)  # 1週目のボス
+        self.current_boss: WeeklyBoss | None = select_weekly_boss(1, rng=self.rng)  # 1週目のボス
         self.boss_preview_shown: bool = False  # 月曜にボス予告を表示したか
         self.boss_result: dict | None = None  # 金曜のボス結果
         # キャラクター別の給料・ボーナス・家賃
@@ -289,6 +291,36 @@ class GameManager:
         if with_initial_relics:
             self.relics.add_initial_relics()
 
+    # __init__ が持たせる状態（_from_state はこれをすべて受け取る）
+    _STATE_ATTRS = (
+        'player', 'stock', 'character_id', 'rng', 'session_seed', 'day_state', 'stats',
+        'relics', 'provisions', 'events', 'has_bonus', 'nutrition_streak', 'behavior_tracker',
+        'weekly_stats', '_daily_food_spending', '_daily_cooked', 'temperament_id',
+        'temperament_just_revealed', 'current_boss', 'boss_preview_shown', 'boss_result',
+        '_salary_amount', '_bonus_amount', '_rent_amount',
+    )
+
+    @classmethod
+    def _from_state(cls, **state) -> 'GameManager':
+        """保存しておいた状態から作る（スナップショットの復元用）
+
+        __init__ を通さないので、作ってから上書きする状態（乱数・ボス抽選・空の在庫など）を
+        無駄に用意しない。
+
+        Raises:
+            ValueError: 状態の属性が足りない・余分・イベントの乱数がセッションの乱数と違う
+        """
+        missing = [name for name in cls._STATE_ATTRS if name not in state]
+        extra = [name for name in state if name not in cls._STATE_ATTRS]
+        if missing or extra:
+            raise ValueError(f"GameManagerの状態が合いません: 不足={missing} 余分={extra}")
+        if state['events'].rng is not state['rng']:
+            raise ValueError("イベントの乱数はセッションの乱数と同じものにしてください")
+        game = cls.__new__(cls)
+        for name in cls._STATE_ATTRS:
+            setattr(game, name, state[name])
+        return game
+
     def get_cooking_energy_cost(self) -> int:
         """レリック効果を反映した調理気力コストを取得"""
         base_cost = COOKING_ENERGY_COST
@@ -782,7 +814,7 @@ class GameManager:
             return "stamina"
         return None
 
-    def get_result(self) -> GameResult:
+    def get_result(self, seed: int | None = None, config_name: str = "default") -> GameResult:
         """ゲーム結果を取得"""
         return self.stats.to_result(
             survived_days=self.day_state.day,
@@ -792,6 +824,8 @@ class GameManager:
             final_money=self.player.money,
             final_stamina=self.player.stamina,
             final_energy=self.player.energy,
+            seed=seed,
+            config_name=config_name,
         )
 
     # === イベント関連 ===
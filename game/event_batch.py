@@ -0,0 +1,118 @@
+"""イベント判定のバッチ処理（シミュレーション用）
+
+同じEventTimingにいる複数ゲームのイベント判定をまとめて行う。
+栄養素による確率補正と乱数判定を (ゲーム数 × 候補イベント数) の配列演算1回で済ませ、
+条件チェックと効果の実行は判定に当たったイベントだけ行う。
+
+NumPyは任意依存。インストールされていなければ各ゲームの
+EventManager.check_and_trigger_events を順番に呼ぶ。
+
+判定の順序（乱数 → 条件）が1ゲームずつの判定と異なるため、発生確率は同じだが
+同じシードでも結果は一致しない。
+"""
+import weakref
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがなければ1ゲームずつ判定する
+    np = None
+
+from .events import EventRegistry, EventResult, EventTiming
+
+
+# 登録簿ごとのタイミング別配列キャッシュ（登録簿は不変なので作り直し不要）
+_ARRAY_CACHE: "weakref.WeakKeyDictionary[EventRegistry, dict]" = weakref.WeakKeyDictionary()
+
+
+def _timing_arrays(registry: EventRegistry, timing: EventTiming):
+    """候補イベントの (基本確率, 気力マイナスか, 体力マイナスか) 配列を取得"""
+    per_timing = _ARRAY_CACHE.get(registry)
+    if per_timing is None:
+        per_timing = {}
+        _ARRAY_CACHE[registry] = per_timing
+
+    arrays = per_timing.get(timing)
+    if arrays is None:
+        candidates = registry.candidates(timing)
+        base = np.array([event.probability for _, event, _ in candidates], dtype=float)
+        energy_negative = np.array([t == 'energy_negative' for _, _, t in candidates], dtype=bool)
+        stamina_negative = np.array([t == 'stamina_negative' for _, _, t in candidates], dtype=bool)
+        arrays = (base, energy_negative, stamina_negative)
+        per_timing[timing] = arrays
+    return arrays
+
+
+def make_batch_rng(seed: int | None = None):
+    """バッチ判定用の乱数を作成（NumPyがなければNone）"""
+    if np is None:
+        return None
+    return np.random.default_rng(seed)
+
+
+def _reduction(values):
+    """栄養素による確率の減少率（最大50%減、0以下なら補正なし）"""
+    return np.where(values > 0, np.minimum(0.5, values * 0.05), 0.0)
+
+
+def trigger_events_batch(timing: EventTiming, games: list, rng=None) -> list[list[EventResult]]:
+    """複数ゲームの指定タイミングのイベントをまとめて判定・実行
+
+    Args:
+        timing: イベント発生タイミング
+        games: GameManagerのリスト（全ゲームが同じイベント登録簿を共有していること）
+        rng: numpy.random.Generator（省略時は新規作成）
+
+    Returns:
+        ゲームごとの発生イベント結果リスト（gamesと同じ順序）
+    """
+    if np is None or not games:
+        return [
+            game.events.check_and_trigger_events(timing, game.get_event_context(), game)
+            for game in games
+        ]
+
+    registry = games[0].events.registry
+    candidates = registry.candidates(timing)
+    results: list[list[EventResult]] = [[] for _ in games]
+    if not candidates:
+        return results
+
+    contexts = []
+    active = np.zeros(len(games), dtype=bool)
+    mental = np.zeros(len(games))
+    defense = np.zeros(len(games))
+    for i, game in enumerate(games):
+        context = game.get_event_context()
+        contexts.append(context)
+        if game.events.prepare_context(timing, context):
+            active[i] = True
+            daily_nutrition = context.get('daily_nutrition', {})
+            mental[i] = daily_nutrition.get('mental', 0)
+            defense[i] = daily_nutrition.get('defense', 0)
+
+    if not active.any():
+        return results
+
+    # 確率を計算（栄養素による補正を適用） shape: (ゲーム数, 候補イベント数)
+    base, energy_negative, stamina_negative = _timing_arrays(registry, timing)
+    factor = np.where(
+        energy_negative[None, :], (1 - _reduction(mental))[:, None],
+        np.where(stamina_negative[None, :], (1 - _reduction(defense))[:, None], 1.0),
+    )
+    probability = base[None, :] * factor
+
+    # 確率判定（全ゲーム・全候補の乱数を一度に引く）
+    if rng is None:
+        rng = np.random.default_rng()
+    hits = rng.random(probability.shape) < probability
+    hits &= active[:, None]
+
+    # 当たったイベントだけ条件チェックして実行（行優先なのでゲーム内は登録順）
+    for game_index, event_index in np.argwhere(hits):
+        game = games[game_index]
+        event_id, event, _ = candidates[event_index]
+        if not game.events.is_eligible(event_id, event, contexts[game_index]):
+            continue
+        results[game_index].append(game.events.trigger(event_id, event, game))
+
+    return results
@@ -1,6 +1,5 @@
 """ランダムイベントデータ（280種類）"""
-import random
-from .events import RandomEvent, EventTiming, Weather
+from .events import RandomEvent, EventRegistry, EventTiming, Weather
 from .constants import NUTRITION_STREAK_FOR_CAP
 
 
@@ -96,9 +95,9 @@ def effect_add_provision(name: str, qty: int = 1):
 def effect_lose_random_ingredient():
     """ランダムな食材を失う"""
     def effect(gm):
-        items = gm.stock.get_all_items()
+        items = gm.stock.get_all()
         if items:
-            name = random.choice(list(items.keys()))
+            name = gm.rng.choice(list(items.keys()))
             gm.stock.remove(name, 1)
             return f"{name}を1個失った..."
         else:
@@ -2559,5 +2558,9 @@ def get_all_events() -> list[RandomEvent]:
 
 
 def register_all_events(event_manager):
-    """全イベントをEventManagerに登録"""
+    """全イベントをEventManagerに登録（互換用。通常はEVENT_REGISTRYを共有する）"""
     event_manager.register_events(get_all_events())
+
+
+# 全セッション共有のイベント登録簿（モジュール読み込み時に1回だけ作成）
+EVENT_REGISTRY = EventRegistry(get_all_events())
@@ -2,7 +2,8 @@
 import random
 from enum import Enum, auto
 from dataclasses import dataclass, field
-from typing import Callable, Any
+from types import MappingProxyType
+from typing import Callable, Any, Iterable
 
 
 class Weather(Enum):
@@ -77,6 +78,15 @@ class RandomEvent:
         return self.effect(game_manager)
 
 
+def resolve_effect_type(event: RandomEvent) -> str | None:
+    """イベントの効果タイプを取得（明示的指定 > effect関数のタグ）"""
+    if event.effect_type is not None:
+        return event.effect_type
+    if event.effect is not None:
+        return getattr(event.effect, '_effect_type', None)
+    return None
+
+
 @dataclass
 class EventResult:
     """イベント実行結果"""
@@ -84,12 +94,64 @@ class EventResult:
     message: str
 
 
+class EventRegistry:
+    """イベント定義の登録簿（不変）
+
+    イベント定義は全セッション共通なので、1つの登録簿を全EventManagerで共有する。
+    追加は新しい登録簿を返す（既存の登録簿は変更しない）。
+    タイミング別の候補リストと効果タイプは登録時に1回だけ求めておく。
+    """
+
+    def __init__(self, events: Iterable[RandomEvent] = ()):
+        events_by_id: dict[str, RandomEvent] = {}
+        for event in events:
+            events_by_id[event.id] = event  # 同じIDは後から登録したもので上書き
+        self._events = MappingProxyType(events_by_id)
+
+        # タイミング → ((イベントID, イベント, 効果タイプ), ...)  登録順を保つ
+        by_timing: dict[EventTiming, list[tuple[str, RandomEvent, str | None]]] = {
+            timing: [] for timing in EventTiming
+        }
+        for event_id, event in events_by_id.items():
+            by_timing[event.timing].append((event_id, event, resolve_effect_type(event)))
+        self._by_timing = {timing: tuple(entries) for timing, entries in by_timing.items()}
+
+    def with_events(self, events: Iterable[RandomEvent]) -> 'EventRegistry':
+        """イベントを追加した新しい登録簿を返す"""
+        return EventRegistry([*self._events.values(), *events])
+
+    def get(self, event_id: str) -> RandomEvent | None:
+        """イベントを取得"""
+        return self._events.get(event_id)
+
+    def items(self):
+        """(イベントID, イベント) の一覧"""
+        return self._events.items()
+
+    def candidates(self, timing: EventTiming) -> tuple[tuple[str, RandomEvent, str | None], ...]:
+        """指定タイミングの (イベントID, イベント, 効果タイプ) 一覧"""
+        return self._by_timing[timing]
+
+    def values(self):
+        """イベントの一覧"""
+        return self._events.values()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
 class EventManager:
-    """イベント管理クラス"""
+    """イベント管理クラス
+
+    イベント定義は共有のEventRegistryを参照し、インスタンスが持つのは
+    セッション固有の状態（天気・今日発生したイベント・乱数）だけ。
+    """
 
-    def __init__(self):
+    def __init__(self, rng: random.Random | None = None,
+                 registry: EventRegistry | None = None):
+        self.rng = rng if rng is not None else random.Random()  # セッション固有の乱数
         self.weather: Weather = Weather.SUNNY
-        self._events: dict[str, RandomEvent] = {}  # 登録されたイベント
+        self._registry = registry if registry is not None else EventRegistry()  # 登録されたイベント（共有）
         self._triggered_today: set[str] = set()    # 今日発生したイベントID
 
     def get_weather_name(self) -> str:
@@ -109,10 +171,8 @@ class EventManager:
 
         確率: 晴れ50%, 曇り30%, 雨15%, 嵐5%
         """
-        if seed is not None:
-            random.seed(seed)
-
-        roll = random.random()
+        rng = random.Random(seed) if seed is not None else self.rng
+        roll = rng.random()
         if roll < 0.50:
             self.weather = Weather.SUNNY
         elif roll < 0.80:
@@ -125,17 +185,55 @@ class EventManager:
         return self.weather
 
     def register_event(self, event: RandomEvent):
-        """イベントを登録"""
-        self._events[event.id] = event
+        """イベントを登録（共有の登録簿は変更せず、このインスタンス用にコピーする）"""
+        self.register_events([event])
 
     def register_events(self, events: list[RandomEvent]):
         """複数イベントを登録"""
-        for event in events:
-            self.register_event(event)
+        self._registry = self._registry.with_events(events)
 
     def get_event(self, event_id: str) -> RandomEvent | None:
         """イベントを取得"""
-        return self._events.get(event_id)
+        return self._registry.get(event_id)
+
+    @property
+    def registry(self) -> EventRegistry:
+        """参照中のイベント登録簿"""
+        return self._registry
+
+    def prepare_context(self, timing: EventTiming, context: dict) -> bool:
+        """イベント判定の前処理。このタイミングでイベントが起こりえなければFalse
+
+        コンテキストに天気を追加する。
+        """
+        # 最初の3日間はイベント発生しない（チュートリアル期間）
+        if context.get('day', 1) <= 3:
+            return False
+
+        # オフィス勤め限定イベント（通勤・退勤イベント）は在宅勤務なら候補なし
+        if timing in (EventTiming.GO_TO_WORK, EventTiming.LEAVE_WORK):
+            if not context.get('is_office_worker', True):
+                return False
+
+        # コンテキストに天気を追加
+        context['weather'] = self.weather
+        return True
+
+    def is_eligible(self, event_id: str, event: RandomEvent, context: dict) -> bool:
+        """1日1回制限と発生条件をチェック"""
+        # 1日1回制限のチェック
+        if event.once_per_day and event_id in self._triggered_today:
+            return False
+
+        # 条件チェック
+        return event.check_condition(context)
+
+    def trigger(self, event_id: str, event: RandomEvent, game_manager) -> EventResult:
+        """確率判定に当たったイベントを実行"""
+        message = event.execute(game_manager)
+        if event.once_per_day:
+            self._triggered_today.add(event_id)
+        return EventResult(event=event, message=message)
 
     def check_and_trigger_events(
         self,
@@ -145,6 +243,8 @@ class EventManager:
     ) -> list[EventResult]:
         """指定タイミングのイベントをチェックし、発生したものを実行
 
+        複数ゲームをまとめて判定する場合は event_batch.trigger_events_batch を使う。
+
         Args:
             timing: イベント発生タイミング
             context: イベント条件判定用のコンテキスト（天気、曜日など）
@@ -155,44 +255,21 @@ class EventManager:
         """
         results = []
 
-        # 最初の3日間はイベント発生しない（チュートリアル期間）
-        if context.get('day', 1) <= 3:
+        if not self.prepare_context(timing, context):
             return results
 
-        # コンテキストに天気を追加
-        context['weather'] = self.weather
-
         # 栄養素による確率補正を計算
         daily_nutrition = context.get('daily_nutrition', {})
         mental = daily_nutrition.get('mental', 0)
         defense = daily_nutrition.get('defense', 0)
 
-        for event_id, event in self._events.items():
-            # タイミングが一致しない場合はスキップ
-            if event.timing != timing:
-                continue
-
-            # オフィス勤め限定イベントのチェック（通勤・退勤イベント）
-            if timing in (EventTiming.GO_TO_WORK, EventTiming.LEAVE_WORK):
-                if not context.get('is_office_worker', True):
-                    continue
-
-            # 1日1回制限のチェック
-            if event.once_per_day and event_id in self._triggered_today:
-                continue
-
-            # 条件チェック
-            if not event.check_condition(context):
+        for event_id, event, effect_type in self._registry.candidates(timing):
+            if not self.is_eligible(event_id, event, context):
                 continue
 
             # 確率を計算（栄養素による補正を適用）
             probability = event.probability
 
-            # effect_typeを取得（明示的指定 > effect関数のタグ）
-            effect_type = event.effect_type
-            if effect_type is None and event.effect is not None:
-                effect_type = getattr(event.effect, '_effect_type', None)
-
             if effect_type == 'energy_negative' and mental > 0:
                 # 心力素が高いほど気力マイナスイベントの確率が下がる（最大50%減）
                 reduction = min(0.5, mental * 0.05)
@@ -203,21 +280,17 @@ class EventManager:
                 probability *= (1 - reduction)
 
             # 確率判定
-            if random.random() >= probability:
+            if self.rng.random() >= probability:
                 continue
 
             # イベント発生
-            message = event.execute(game_manager)
-            results.append(EventResult(event=event, message=message))
-
-            if event.once_per_day:
-                self._triggered_today.add(event_id)
+            results.append(self.trigger(event_id, event, game_manager))
 
         return results
 
     def force_trigger_event(self, event_id: str, game_manager) -> EventResult | None:
         """イベントを強制発生"""
-        event = self._events.get(event_id)
+        event = self._registry.get(event_id)
         if event is None:
             return None
 
@@ -230,11 +303,11 @@ class EventManager:
 
     def get_events_by_timing(self, timing: EventTiming) -> list[RandomEvent]:
         """指定タイミングのイベント一覧を取得"""
-        return [e for e in self._events.values() if e.timing == timing]
+        return [event for _, event, _ in self._registry.candidates(timing)]
 
     def get_all_events(self) -> list[RandomEvent]:
         """全イベント一覧を取得"""
-        return list(self._events.values())
+        return list(self._registry.values())
 
     def is_rainy(self) -> bool:
         """雨かどうか"""
@@ -1,8 +1,10 @@
 """食材データ・ストック管理"""
 from __future__ import annotations
+import heapq
 import random
+from collections import deque
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Iterator
 from .nutrition import Nutrition, create_nutrition
 
 if TYPE_CHECKING:
@@ -179,77 +181,319 @@ DISTANT_ONLY_INGREDIENTS = {
 # 全食材（通常 + 限定）を統合した辞書
 ALL_INGREDIENTS = {**INGREDIENTS, **DISTANT_ONLY_INGREDIENTS}
 
+# 食材名 → ビット（ALL_INGREDIENTSの定義順で固定。食材の集合を整数のビットマスクで表す）
+INGREDIENT_BITS: dict[str, int] = {name: 1 << i for i, name in enumerate(ALL_INGREDIENTS)}
+
+
+def ingredient_mask(names: Iterable[str]) -> int:
+    """食材名の集合をビットマスクに変換（未知の食材は無視）"""
+    mask = 0
+    for name in names:
+        mask |= INGREDIENT_BITS.get(name, 0)
+    return mask
+
+
+# 鮮度補正の下限
+MIN_FRESHNESS_MODIFIER = 0.1
+
+
+def _build_freshness_tables() -> tuple[dict[str, tuple[float, ...]], dict[str, tuple[str, ...]]]:
+    """食材ごとに「期限日を過ぎた日数 → 鮮度補正値 / 栄養ペナルティ表示」の表を作る
+
+    表の最後の要素が下限（0.1）で、それ以上過ぎた分は最後の要素を使う。
+    """
+    modifiers: dict[str, tuple[float, ...]] = {}
+    labels: dict[str, tuple[str, ...]] = {}
+    for name, ingredient in ALL_INGREDIENTS.items():
+        values = [1.0]
+        excess_days = 0
+        while values[-1] > MIN_FRESHNESS_MODIFIER and ingredient.decay_rate > 0:
+            excess_days += 1
+            values.append(max(MIN_FRESHNESS_MODIFIER, 1.0 - (excess_days * ingredient.decay_rate)))
+        modifiers[name] = tuple(values)
+        labels[name] = tuple(f"栄養-{int((1.0 - value) * 100)}%" for value in values)
+    return modifiers, labels
+
+
+# 食材名 → 期限日を過ぎた日数（0〜）ごとの鮮度補正値 / 栄養ペナルティ表示
+FRESHNESS_MODIFIER_TABLE, FRESHNESS_PENALTY_LABELS = _build_freshness_tables()
+
+# 残り日数の表示（鮮度維持日数 + 延長の範囲ならここから引く）
+_REMAINING_LABELS = tuple(
+    f"残り{days}日"
+    for days in range(max(ingredient.freshness_days for ingredient in ALL_INGREDIENTS.values()) + 31)
+)
+
+
+def freshness_modifier(ingredient: Ingredient, elapsed_days: int, extend_days: int = 0) -> float:
+    """購入からの経過日数に対する鮮度補正値（0.1〜1.0）
+
+    Args:
+        ingredient: 食材
+        elapsed_days: 購入日からの経過日数
+        extend_days: レリック効果による鮮度延長日数
+    """
+    # レリック効果で鮮度維持日数を延長
+    excess_days = elapsed_days - (ingredient.freshness_days + extend_days)
+    if excess_days <= 0:
+        return 1.0  # 鮮度維持期間内
+
+    # 超過日数に応じて減衰（表にない食材はその場で計算）
+    table = FRESHNESS_MODIFIER_TABLE.get(ingredient.name)
+    if table is None:
+        return max(MIN_FRESHNESS_MODIFIER, 1.0 - (excess_days * ingredient.decay_rate))
+    return table[min(excess_days, len(table) - 1)]
+
+
+def freshness_penalty_label(ingredient: Ingredient, excess_days: int) -> str:
+    """期限日を過ぎた日数に対する栄養ペナルティ表示（"栄養-N%"）"""
+    labels = FRESHNESS_PENALTY_LABELS.get(ingredient.name)
+    if labels is None:
+        modifier = freshness_modifier(ingredient, excess_days + ingredient.freshness_days)
+        return f"栄養-{int((1.0 - modifier) * 100)}%"
+    return labels[min(max(0, excess_days), len(labels) - 1)]
+
+
+def remaining_days_label(days: int) -> str:
+    """残り日数の表示（"残りN日"）"""
+    if 0 <= days < len(_REMAINING_LABELS):
+        return _REMAINING_LABELS[days]
+    return f"残り{days}日"
+
 
 class Stock:
     """食材ストック管理（鮮度対応版）
 
-    内部構造: {食材名: [購入日1, 購入日2, ...]}
-    各食材の個々の購入日を記録し、古いものから消費する。
+    内部構造: {食材名: deque([(購入日, 個数), ...])}
+    同じ購入日の食材はまとめて1組で持ち、購入日の古い順に並べて古いものから消費する。
+    食材ごとの合計個数と、在庫のある食材の集合のビットマスク（INGREDIENT_BITS）も保持する。
+
+    期限インデックス: 食材ごとの「最も古い食材の鮮度維持期間の最終日（期限日）」と、
+    その最小ヒープ。鮮度延長（int or RelicInventory）ごとに値が変わるので、
+    最後に問い合わせた鮮度延長について持ち、別の鮮度延長やレリックの変化で作り直す。
+    ヒープは遅延削除（期限日が変わったら新しい組を積み、古い組は問い合わせ時に読み飛ばす）。
     """
 
     def __init__(self):
-        self._items: dict[str, list[int]] = {}
+        self.version = 0  # 在庫が変わるたびに増える（APIの状態キャッシュの判定用）
+        self._items: dict[str, deque[tuple[int, int]]] = {}
+        self._counts: dict[str, int] = {}  # 食材名 → 合計個数
+        self._mask = 0  # 在庫のある食材のビットマスク
+        # 期限インデックス（最初の問い合わせで作る）
+        self._expiry_key: tuple | None = None  # 作ったときの鮮度延長
+        self._expiry_extend: int | RelicInventory = 0
+        self._expiry_days: dict[str, int] = {}  # 食材名 → 期限日
+        self._expiry_heap: list[tuple[int, str]] = []  # (期限日, 食材名)
 
     def add(self, ingredient_name: str, quantity: int = 1, current_day: int = 1):
         """食材を追加する（購入日を記録）"""
-        if ingredient_name not in self._items:
-            self._items[ingredient_name] = []
-        for _ in range(quantity):
-            self._items[ingredient_name].append(current_day)
+        if quantity <= 0:
+            return
+        self.version += 1
+        batches = self._items.get(ingredient_name)
+        if batches is None:
+            batches = deque()
+            self._items[ingredient_name] = batches
+            self._mask |= INGREDIENT_BITS.get(ingredient_name, 0)
+
+        # 購入日の古い順を保つ（期限近い商品は購入日を前にずらして追加されることがある）
+        i = len(batches)
+        while i > 0 and batches[i - 1][0] > current_day:
+            i -= 1
+        if i > 0 and batches[i - 1][0] == current_day:
+            batches[i - 1] = (current_day, batches[i - 1][1] + quantity)
+        else:
+            batches.insert(i, (current_day, quantity))
+            if i == 0:
+                self._refresh_expiry(ingredient_name)  # 最も古い購入日が変わった
+        self._counts[ingredient_name] = self._counts.get(ingredient_name, 0) + quantity
+
+    def _take(self, ingredient_name: str, quantity: int) -> list[tuple[int, int]]:
+        """古いものから指定数を取り出し、取り出した (購入日, 個数) のリストを返す"""
+        self.version += 1
+        batches = self._items[ingredient_name]
+        taken = []
+        remaining = quantity
+        while remaining > 0:
+            day, count = batches[0]
+            if count <= remaining:
+                batches.popleft()
+                taken.append((day, count))
+                remaining -= count
+            else:
+                batches[0] = (day, count - remaining)
+                taken.append((day, remaining))
+                remaining = 0
+
+        self._counts[ingredient_name] -= quantity
+        if not batches:
+            del self._items[ingredient_name]
+            del self._counts[ingredient_name]
+            self._mask &= ~INGREDIENT_BITS.get(ingredient_name, 0)
+        if not batches or batches[0][0] != taken[0][0]:
+            self._refresh_expiry(ingredient_name)  # 最も古い購入日が変わった
+        return taken
 
     def remove(self, ingredient_name: str, quantity: int = 1) -> list[int]:
         """食材を消費する（古いものから）。消費した食材の購入日リストを返す"""
-        if ingredient_name not in self._items:
+        if self._counts.get(ingredient_name, 0) < quantity or quantity <= 0:
             return []
-        items = self._items[ingredient_name]
-        if len(items) < quantity:
-            return []
-        # 古いものから消費（リストはソート済み前提）
-        consumed = items[:quantity]
-        self._items[ingredient_name] = items[quantity:]
-        if not self._items[ingredient_name]:
-            del self._items[ingredient_name]
+        consumed = []
+        for day, count in self._take(ingredient_name, quantity):
+            consumed.extend([day] * count)
         return consumed
 
     def discard(self, ingredient_name: str, quantity: int = 1) -> int:
         """食材を廃棄する（古いものから）。廃棄した数を返す"""
-        if ingredient_name not in self._items:
+        discard_count = min(quantity, self._counts.get(ingredient_name, 0))
+        if discard_count <= 0:
             return 0
-        items = self._items[ingredient_name]
-        discard_count = min(quantity, len(items))
-        self._items[ingredient_name] = items[discard_count:]
-        if not self._items[ingredient_name]:
-            del self._items[ingredient_name]
+        self._take(ingredient_name, discard_count)
         return discard_count
 
     def has(self, ingredient_name: str, quantity: int = 1) -> bool:
         """指定量の食材があるか確認"""
-        return len(self._items.get(ingredient_name, [])) >= quantity
+        return self._counts.get(ingredient_name, 0) >= quantity
 
     def get_quantity(self, ingredient_name: str) -> int:
         """食材の数量を取得"""
-        return len(self._items.get(ingredient_name, []))
+        return self._counts.get(ingredient_name, 0)
 
     def get_all(self) -> dict[str, int]:
         """全ストックを取得（数量のみ、後方互換用）"""
-        return {name: len(days) for name, days in self._items.items() if days}
+        return dict(self._counts)
 
     def get_all_with_days(self) -> dict[str, list[int]]:
-        """全ストックを購入日付きで取得"""
-        return {name: days.copy() for name, days in self._items.items() if days}
+        """全ストックを購入日付きで取得（1個ずつの購入日リスト、後方互換用）"""
+        return {
+            name: [day for day, count in batches for _ in range(count)]
+            for name, batches in self._items.items()
+        }
+
+    def get_batches(self, ingredient_name: str) -> list[tuple[int, int]]:
+        """指定食材の (購入日, 個数) のリストを取得（購入日の古い順）"""
+        return list(self._items.get(ingredient_name, ()))
+
+    def iter_batches(self) -> Iterator[tuple[str, int, int]]:
+        """全ストックの (食材名, 購入日, 個数) を順に返す"""
+        for name, batches in self._items.items():
+            for day, count in batches:
+                yield name, day, count
 
     def is_empty(self) -> bool:
         """ストックが空か確認"""
-        return all(len(days) == 0 for days in self._items.values())
+        return not self._counts
 
     def get_available_ingredients(self) -> list[str]:
         """利用可能な食材名のリストを取得"""
-        return [name for name, days in self._items.items() if days]
+        return list(self._items)
+
+    def get_mask(self) -> int:
+        """在庫のある食材のビットマスクを取得"""
+        return self._mask
+
+    # === 期限インデックス ===
+
+    @staticmethod
+    def _extend_key(freshness_extend: int | RelicInventory) -> tuple:
+        """鮮度延長の識別子（RelicInventoryは所持レリックが変わると別物とみなす）"""
+        if isinstance(freshness_extend, int):
+            return ('days', freshness_extend)
+        return ('relics', id(freshness_extend), freshness_extend.version)
+
+    def _compute_expiry(self, ingredient_name: str) -> int | None:
+        """最も古い食材の期限日（鮮度維持期間の最終日）を計算"""
+        batches = self._items.get(ingredient_name)
+        ingredient = get_ingredient(ingredient_name)
+        if not batches or ingredient is None:
+            return None
+        oldest_day = batches[0][0]
+        if isinstance(self._expiry_extend, int):
+            extend_days = self._expiry_extend
+        else:
+            extend_days = self._expiry_extend.get_freshness_extend_for_purchase_day(oldest_day)
+        return oldest_day + ingredient.freshness_days + extend_days
+
+    def _refresh_expiry(self, ingredient_name: str):
+        """食材の最も古い購入日が変わったときにインデックスを更新"""
+        if self._expiry_key is None:
+            return
+        expiry_day = self._compute_expiry(ingredient_name)
+        if expiry_day is None:
+            self._expiry_days.pop(ingredient_name, None)
+            return
+        if self._expiry_days.get(ingredient_name) == expiry_day:
+            return
+        self._expiry_days[ingredient_name] = expiry_day
+        heapq.heappush(self._expiry_heap, (expiry_day, ingredient_name))
+        # 読み飛ばす組が増えすぎたら詰め直す
+        if len(self._expiry_heap) > 2 * len(self._expiry_days) + 32:
+            self._expiry_heap = [(day, name) for name, day in self._expiry_days.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _ensure_expiry_index(self, freshness_extend: int | RelicInventory):
+        """指定の鮮度延長のインデックスを用意（違う鮮度延長なら作り直す）"""
+        key = self._extend_key(freshness_extend)
+        if key == self._expiry_key:
+            return
+        self._expiry_key = key
+        self._expiry_extend = freshness_extend  # id()を使い回されないよう参照を保持
+        self._expiry_days = {}
+        for name in self._items:
+            expiry_day = self._compute_expiry(name)
+            if expiry_day is not None:
+                self._expiry_days[name] = expiry_day
+        self._expiry_heap = [(day, name) for name, day in self._expiry_days.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def _expiring_before(self, day: int, freshness_extend: int | RelicInventory) -> list[tuple[int, str]]:
+        """期限日がdayより前の (期限日, 食材名) を期限日の早い順に取得
+
+        ヒープを根から辿り、期限日がday以上の枝は見ないので、該当する数に比例する時間で済む。
+        """
+        self._ensure_expiry_index(freshness_extend)
+        heap = self._expiry_heap
+        result = []
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            expiry_day, name = heap[i]
+            if expiry_day >= day:
+                continue
+            if self._expiry_days.get(name) == expiry_day:
+                result.append((expiry_day, name))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    stack.append(child)
+        # 同じ組が重複して積まれていることがある
+        return sorted(set(result))
+
+    def get_expiry_day(self, ingredient_name: str,
+                       freshness_extend: int | RelicInventory = 0) -> int | None:
+        """最も古い食材の期限日（この日までは鮮度補正なし）を取得"""
+        self._ensure_expiry_index(freshness_extend)
+        return self._expiry_days.get(ingredient_name)
+
+    def get_next_expiry(self, freshness_extend: int | RelicInventory = 0) -> tuple[int, str] | None:
+        """期限日が最も早い (期限日, 食材名) を取得"""
+        self._ensure_expiry_index(freshness_extend)
+        heap = self._expiry_heap
+        while heap and self._expiry_days.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def get_expiring_ingredients(self, current_day: int, freshness_extend: int | RelicInventory = 0,
+                                 days_ahead: int = 0) -> list[str]:
+        """期限日が current_day + days_ahead 以前の食材名を期限日の早い順に取得
+
+        days_ahead=0 なら「今日が期限、または期限切れ」の食材。
+        """
+        return [name for _, name in self._expiring_before(current_day + days_ahead + 1, freshness_extend)]
 
     def get_oldest_day(self, ingredient_name: str) -> int | None:
         """指定食材の最も古い購入日を取得"""
-        items = self._items.get(ingredient_name, [])
-        return items[0] if items else None
+        batches = self._items.get(ingredient_name)
+        return batches[0][0] if batches else None
 
     def calculate_freshness_modifier(self, ingredient_name: str, current_day: int,
                                        freshness_extend: int | RelicInventory = 0) -> float:
@@ -260,32 +504,15 @@ class Stock:
             freshness_extend: 鮮度延長日数（int）またはRelicInventory
                               RelicInventoryの場合、食材購入日を考慮して適切な延長日数を計算
         """
-        oldest_day = self.get_oldest_day(ingredient_name)
-        if oldest_day is None:
+        # 期限日はインデックスから（購入日を考慮した鮮度延長込み）
+        expiry_day = self.get_expiry_day(ingredient_name, freshness_extend)
+        if expiry_day is None:
             return 1.0
 
         ingredient = get_ingredient(ingredient_name)
-        if ingredient is None:
-            return 1.0
-
-        # 鮮度延長日数を計算
-        if isinstance(freshness_extend, int):
-            extend_days = freshness_extend
-        else:
-            # RelicInventoryの場合、食材購入日を考慮
-            extend_days = freshness_extend.get_freshness_extend_for_purchase_day(oldest_day)
-
-        # レリック効果で鮮度維持日数を延長
-        effective_freshness_days = ingredient.freshness_days + extend_days
-
-        elapsed_days = current_day - oldest_day
-        if elapsed_days <= effective_freshness_days:
-            return 1.0  # 鮮度維持期間内
-
-        # 超過日数に応じて減衰
-        excess_days = elapsed_days - effective_freshness_days
-        modifier = 1.0 - (excess_days * ingredient.decay_rate)
-        return max(0.1, modifier)  # 最低10%
+        oldest_day = self._items[ingredient_name][0][0]
+        extend_days = expiry_day - oldest_day - ingredient.freshness_days
+        return freshness_modifier(ingredient, current_day - oldest_day, extend_days)
 
     def get_freshness_status(self, ingredient_name: str, current_day: int,
                              freshness_extend: int | RelicInventory = 0) -> str:
@@ -295,35 +522,21 @@ class Stock:
             current_day: 現在のゲーム日
             freshness_extend: 鮮度延長日数（int）またはRelicInventory
         """
-        oldest_day = self.get_oldest_day(ingredient_name)
-        if oldest_day is None:
+        # 期限日はインデックスから（購入日を考慮した鮮度延長込み）
+        expiry_day = self.get_expiry_day(ingredient_name, freshness_extend)
+        if expiry_day is None:
             return ""
 
-        ingredient = get_ingredient(ingredient_name)
-        if ingredient is None:
-            return ""
-
-        # 鮮度延長日数を計算
-        if isinstance(freshness_extend, int):
-            extend_days = freshness_extend
-        else:
-            # RelicInventoryの場合、食材購入日を考慮
-            extend_days = freshness_extend.get_freshness_extend_for_purchase_day(oldest_day)
-
-        # レリック効果で鮮度維持日数を延長
-        effective_freshness_days = ingredient.freshness_days + extend_days
-
-        elapsed_days = current_day - oldest_day
-        remaining = effective_freshness_days - elapsed_days
+        # レリック効果で延長された鮮度維持日数
+        effective_freshness_days = expiry_day - self._items[ingredient_name][0][0]
+        remaining = expiry_day - current_day
 
         if remaining > 0:
             if remaining >= effective_freshness_days:
                 return "新鮮"
-            return f"残り{remaining}日"
+            return remaining_days_label(remaining)
         else:
-            modifier = self.calculate_freshness_modifier(ingredient_name, current_day, freshness_extend)
-            penalty = int((1.0 - modifier) * 100)
-            return f"栄養-{penalty}%"
+            return freshness_penalty_label(get_ingredient(ingredient_name), -remaining)
 
     def get_items_for_discard(self, current_day: int,
                                freshness_extend: int | RelicInventory = 0) -> list[tuple[str, int, int, float]]:
@@ -334,26 +547,25 @@ class Stock:
         Returns: [(食材名, 数量, 経過日数, 鮮度補正値), ...]
         """
         result = []
-        for name, days in self._items.items():
-            if not days:
-                continue
-            oldest_day = days[0]
-            elapsed = current_day - oldest_day
+        # 期限切れ（期限日を過ぎた）もののみ対象
+        for _, name in self._expiring_before(current_day, freshness_extend):
+            elapsed = current_day - self._items[name][0][0]
             modifier = self.calculate_freshness_modifier(name, current_day, freshness_extend)
-            # 期限切れ（鮮度が落ちた）もののみ対象
             if modifier < 1.0:
-                result.append((name, len(days), elapsed, modifier))
+                result.append((name, self._counts[name], elapsed, modifier))
         # 鮮度が低い順（modifier が小さい順）にソート
         result.sort(key=lambda x: x[3])
         return result
 
     def has_expired_items(self, current_day: int, freshness_extend: int | RelicInventory = 0) -> bool:
         """期限切れ食材があるかチェック"""
-        for name in self._items:
-            modifier = self.calculate_freshness_modifier(name, current_day, freshness_extend)
-            if modifier < 1.0:
-                return True
-        return False
+        next_expiry = self.get_next_expiry(freshness_extend)
+        if next_expiry is None or next_expiry[0] >= current_day:
+            return False
+        return any(
+            self.calculate_freshness_modifier(name, current_day, freshness_extend) < 1.0
+            for _, name in self._expiring_before(current_day, freshness_extend)
+        )
 
 
 def get_ingredient(name: str) -> Ingredient | None:
@@ -380,7 +592,8 @@ class ShopItem:
     freshness_days_left: int  # 購入時の残り鮮度日数（near_expiryの場合は少ない）
 
 
-def generate_daily_shop_items(seed: int | None = None) -> list[ShopItem]:
+def generate_daily_shop_items(seed: int | None = None,
+                              rng: random.Random | None = None) -> list[ShopItem]:
     """その日の店頭商品を生成（5種類、カテゴリ固定、1つ2割引、1つ半額で期限近い）
 
     カテゴリ構成:
@@ -389,9 +602,14 @@ def generate_daily_shop_items(seed: int | None = None) -> list[ShopItem]:
     - 肉または魚: 1
     - 卵乳または豆: 1
     - その他（きのこ、果物、調味料）: 1
+
+    seedを指定した場合はそのシード専用の乱数で生成する（グローバルな乱数状態は変えない）。
+    seedがなければrng（省略時はグローバルなrandom）から引く。
     """
     if seed is not None:
-        random.seed(seed)
+        rng = random.Random(seed)
+    elif rng is None:
+        rng = random
 
     # カテゴリ別に食材を分類
     by_category: dict[str, list[Ingredient]] = {}
@@ -404,41 +622,41 @@ def generate_daily_shop_items(seed: int | None = None) -> list[ShopItem]:
 
     # 1. 穀物から1つ（米など主食）
     if '穀物' in by_category:
-        selected.append(random.choice(by_category['穀物']))
+        selected.append(rng.choice(by_category['穀物']))
 
     # 2. 野菜から1つ
     if '野菜' in by_category:
-        selected.append(random.choice(by_category['野菜']))
+        selected.append(rng.choice(by_category['野菜']))
 
     # 3. 肉か魚から1つ
     meat_fish = by_category.get('肉', []) + by_category.get('魚', [])
     if meat_fish:
-        selected.append(random.choice(meat_fish))
+        selected.append(rng.choice(meat_fish))
 
     # 4. 卵乳か豆から1つ
     egg_bean = by_category.get('卵乳', []) + by_category.get('豆', [])
     if egg_bean:
-        selected.append(random.choice(egg_bean))
+        selected.append(rng.choice(egg_bean))
 
     # 5. その他から1つ（きのこ、果物、調味料）
     others = by_category.get('きのこ', []) + by_category.get('果物', []) + by_category.get('調味料', [])
     if others:
-        selected.append(random.choice(others))
+        selected.append(rng.choice(others))
 
     # 足りない場合はランダムに追加
     all_ingredients = list(INGREDIENTS.values())
     while len(selected) < 5:
-        ing = random.choice(all_ingredients)
+        ing = rng.choice(all_ingredients)
         if ing not in selected:
             selected.append(ing)
 
     # シャッフル
-    random.shuffle(selected)
+    rng.shuffle(selected)
 
     # 価格設定
     shop_items = []
-    discount_idx = random.randint(0, len(selected) - 1)  # 2割引の商品
-    near_expiry_idx = (discount_idx + 1 + random.randint(0, len(selected) - 2)) % len(selected)  # 半額商品
+    discount_idx = rng.randint(0, len(selected) - 1)  # 2割引の商品
+    near_expiry_idx = (discount_idx + 1 + rng.randint(0, len(selected) - 2)) % len(selected)  # 半額商品
 
     for i, ing in enumerate(selected):
         if i == discount_idx:
@@ -456,7 +674,8 @@ def generate_daily_shop_items(seed: int | None = None) -> list[ShopItem]:
     return shop_items
 
 
-def generate_distant_shop_items(seed: int | None = None) -> list[ShopItem]:
+def generate_distant_shop_items(seed: int | None = None,
+                                rng: random.Random | None = None) -> list[ShopItem]:
     """遠くのスーパーの店頭商品を生成（7種類、限定食材含む、セール多め）
 
     特徴:
@@ -465,7 +684,9 @@ def generate_distant_shop_items(seed: int | None = None) -> list[ShopItem]:
     - 限定食材は必ず含まれる
     """
     if seed is not None:
-        random.seed(seed + 1000)  # 近所と異なるシードを使用
+        rng = random.Random(seed + 1000)  # 近所と異なるシードを使用
+    elif rng is None:
+        rng = random
 
     # カテゴリ別に食材を分類（通常食材のみ）
     by_category: dict[str, list[Ingredient]] = {}
@@ -478,34 +699,34 @@ def generate_distant_shop_items(seed: int | None = None) -> list[ShopItem]:
 
     # 1. 穀物から1つ
     if '穀物' in by_category:
-        selected.append(random.choice(by_category['穀物']))
+        selected.append(rng.choice(by_category['穀物']))
 
     # 2. 野菜から1つ
     if '野菜' in by_category:
-        selected.append(random.choice(by_category['野菜']))
+        selected.append(rng.choice(by_category['野菜']))
 
     # 3. 肉か魚から1つ
     meat_fish = by_category.get('肉', []) + by_category.get('魚', [])
     if meat_fish:
-        selected.append(random.choice(meat_fish))
+        selected.append(rng.choice(meat_fish))
 
     # 4. 卵乳か豆から1つ
     egg_bean = by_category.get('卵乳', []) + by_category.get('豆', [])
     if egg_bean:
-        selected.append(random.choice(egg_bean))
+        selected.append(rng.choice(egg_bean))
 
     # 5. その他から1つ
     others = by_category.get('きのこ', []) + by_category.get('果物', []) + by_category.get('調味料', [])
     if others:
-        selected.append(random.choice(others))
+        selected.append(rng.choice(others))
 
     # 6-7. 限定食材から2つ
     distant_list = list(DISTANT_ONLY_INGREDIENTS.values())
-    random.shuffle(distant_list)
+    rng.shuffle(distant_list)
     selected.extend(distant_list[:2])
 
     # シャッフル
-    random.shuffle(selected)
+    rng.shuffle(selected)
 
     # 価格設定（セール率50%）
     shop_items = []
@@ -514,7 +735,7 @@ def generate_distant_shop_items(seed: int | None = None) -> list[ShopItem]:
 
     for ing in selected:
         # 50%の確率でセール（最大3つまで）
-        is_sale = random.random() < 0.5 and sale_count < max_sales
+        is_sale = rng.random() < 0.5 and sale_count < max_sales
 
         if is_sale:
             sale_count += 1
@@ -0,0 +1,317 @@
+"""献立プランナー（在庫から最適な料理の食材の組み合わせを探す）
+
+食材ごとの鮮度補正・レリック効果込みの栄養と満腹度を求め、
+分枝限定法で「栄養の不足を埋め、満腹になり、傷みかけの食材から使う」
+組み合わせを探す。ネームド料理は候補が少ないので個別に正確に評価する。
+
+評価値（MealPlan.score）:
+    coverage * 主要栄養素（活力・心力・持続）の閾値までの不足を埋めた量
+  + nutrition * 栄養の合計
+  + fullness * 満腹度（満腹を超えた分は数えない）
+  + urgency * 明日まで待つと失われる価値（鮮度の落ち分）
+  - keep * 明日に残した場合の価値（食材を使うコスト）
+
+ネームド料理以外の評価値は劣モジュラ（不足の穴埋めと満腹度が頭打ちになる）なので、
+「残りの食材を1つずつ今の組み合わせに足したときの増分」の上位の合計が上界になる。
+"""
+import heapq
+from dataclasses import dataclass
+
+from .constants import MAX_FULLNESS, NUTRITION_MIN_THRESHOLD
+from .cooking import (
+    SIMPLE_RECIPES, CookingEvaluation, evaluate_cooking, find_named_recipe,
+    get_named_recipes_for_mask,
+)
+from .ingredients import Stock, get_ingredient
+from .nutrition import Nutrition
+from .relic import RelicInventory
+
+
+# 閾値判定の対象となる主要栄養素（Nutritionのフィールド順での位置: 活力・心力・持続）
+_KEY_NUTRIENTS = (0, 1, 3)
+
+
+@dataclass
+class PlannerWeights:
+    """献立の評価値の重み"""
+    coverage: float = 3.0   # 主要栄養素の不足を埋めた量1あたり
+    nutrition: float = 0.5  # 栄養の合計1あたり
+    fullness: float = 1.0   # 満腹度1あたり（満腹を超えた分は0）
+    urgency: float = 1.0    # 明日まで待つと失われる価値1あたり
+    keep: float = 0.4       # 明日に残した場合の価値1あたり（使うことのコスト）
+
+
+DEFAULT_WEIGHTS = PlannerWeights()
+
+
+@dataclass
+class MealPlan:
+    """献立の候補（1品分）"""
+    ingredients: list[str]
+    dish_name: str
+    nutrition: Nutrition  # 鮮度補正・レリック効果・ネームド料理ボーナス込み
+    fullness: int
+    score: float
+    named_recipe_name: str | None
+    evaluation: CookingEvaluation  # evaluate_cookingによる評価（食事トータル）
+
+
+@dataclass
+class _Item:
+    """食材1つ分の調理時の値"""
+    name: str
+    vec: tuple[int, int, int, int, int]  # 鮮度補正・レリック効果込みの栄養
+    fullness: int
+    linear: float  # 使ったときの鮮度による加減点（urgency - keep）
+
+
+def _nutrition_vec(n: Nutrition) -> tuple[int, int, int, int, int]:
+    return n.to_row()
+
+
+def _cooked_vec(ingredient, name: str, modifier: float,
+                relics: RelicInventory | None) -> tuple[int, int, int, int, int]:
+    """cook()と同じ計算で、食材1つ分の栄養を求める"""
+    nutrition = Nutrition()
+    nutrition.add_scaled(ingredient.nutrition, modifier)
+    if relics:
+        nutrition_boost = relics.get_nutrition_boost(name)
+        if nutrition_boost > 0:
+            nutrition.add_scaled(ingredient.nutrition, nutrition_boost)
+    return nutrition.to_row()
+
+
+def _build_items(stock: Stock, current_day: int, relics: RelicInventory | None,
+                 weights: PlannerWeights) -> list[_Item]:
+    """在庫の食材（種類ごとに1つ）の調理時の値を求める"""
+    freshness_arg = relics if relics else 0
+    items = []
+    for name in stock.get_available_ingredients():
+        ingredient = get_ingredient(name)
+        if ingredient is None:
+            continue
+
+        fullness = ingredient.fullness
+        if relics:
+            fullness += relics.get_fullness_boost(name)
+
+        today = _cooked_vec(
+            ingredient, name, stock.calculate_freshness_modifier(name, current_day, freshness_arg), relics)
+        tomorrow = _cooked_vec(
+            ingredient, name, stock.calculate_freshness_modifier(name, current_day + 1, freshness_arg), relics)
+
+        today_value = sum(today) + fullness
+        tomorrow_value = sum(tomorrow) + fullness
+        linear = weights.urgency * (today_value - tomorrow_value) - weights.keep * tomorrow_value
+        items.append(_Item(name, today, fullness, linear))
+    return items
+
+
+class _Scorer:
+    """評価値の計算（基準となる栄養と満腹度の余地を保持）"""
+
+    def __init__(self, base: tuple[int, ...], room: int, threshold: int, weights: PlannerWeights):
+        self.base = base
+        self.room = max(0, room)
+        self.threshold = threshold
+        self.weights = weights
+
+    def score(self, vec, fullness: int, linear: float) -> float:
+        w = self.weights
+        t = self.threshold
+        coverage = 0
+        for k in _KEY_NUTRIENTS:
+            b = self.base[k]
+            if b < t:
+                coverage += min(b + vec[k], t) - b
+        return (w.coverage * coverage + w.nutrition * sum(vec)
+                + w.fullness * min(self.room, fullness) + linear)
+
+    def modular(self, item: '_Item') -> float:
+        """評価値のうち、組み合わせによらず食材ごとに足し算になる部分"""
+        return self.weights.nutrition * sum(item.vec) + item.linear
+
+    def saturating_cap(self, vec, fullness: int) -> float:
+        """不足の穴埋めと満腹度の、これ以上増やせる評価値の上限"""
+        w = self.weights
+        t = self.threshold
+        deficit = 0
+        for k in _KEY_NUTRIENTS:
+            b = self.base[k]
+            if b < t:
+                deficit += t - min(b + vec[k], t)
+        return w.coverage * deficit + w.fullness * max(0, self.room - fullness)
+
+    def nutrition_good(self, vec) -> bool:
+        """evaluate_cookingと同じ基準（主要栄養素のうち2つ以上が閾値以上）"""
+        return sum(1 for k in _KEY_NUTRIENTS if self.base[k] + vec[k] >= self.threshold) >= 2
+
+
+def _push_top(top: list[float], value: float, size: int):
+    """正の値のうち大きい方からsize個を最小ヒープに保持"""
+    if value <= 0:
+        return
+    if len(top) < size:
+        heapq.heappush(top, value)
+    elif value > top[0]:
+        heapq.heapreplace(top, value)
+
+
+def _add(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3], a[4] + b[4])
+
+
+def plan_meal(
+    stock: Stock,
+    current_day: int,
+    relics: RelicInventory | None = None,
+    meal_nutrition: Nutrition | None = None,
+    meal_fullness: int = 0,
+    daily_nutrition: Nutrition | None = None,
+    max_ingredients: int = 5,
+    top_k: int = 3,
+    require_nutrition_good: bool = False,
+    weights: PlannerWeights = DEFAULT_WEIGHTS,
+) -> list[MealPlan]:
+    """在庫から評価値の高い料理の食材の組み合わせを探す
+
+    Args:
+        stock: 食材ストック
+        current_day: 現在のゲーム日（鮮度計算用）
+        relics: レリックインベントリ（効果適用用）
+        meal_nutrition: この食事で既に摂取した栄養（複数料理の場合）
+        meal_fullness: この食事で既に得た満腹度
+        daily_nutrition: 栄養の不足判定の基準（省略時はmeal_nutrition）
+        max_ingredients: 1品に使う食材の最大数
+        top_k: 返す候補の数
+        require_nutrition_good: 食事トータルで栄養評価が「良い」になる組み合わせに限る
+        weights: 評価値の重み
+
+    Returns:
+        評価値の高い順の献立候補（評価値が正のもののみ）
+    """
+    items = _build_items(stock, current_day, relics, weights)
+    base_nutrition = daily_nutrition if daily_nutrition is not None else meal_nutrition
+    base = _nutrition_vec(base_nutrition) if base_nutrition is not None else (0, 0, 0, 0, 0)
+    scorer = _Scorer(base, MAX_FULLNESS - meal_fullness, NUTRITION_MIN_THRESHOLD, weights)
+    item_by_name = {item.name: item for item in items}
+
+    # 上位top_k件を保持する最小ヒープ: (評価値, 連番, 食材のfrozenset, 栄養, 満腹度)
+    best: list[tuple[float, int, frozenset, tuple, int]] = []
+    seen: set[frozenset] = set()
+    counter = 0
+
+    def threshold() -> float:
+        return best[0][0] if len(best) >= top_k else 0.0
+
+    def record(names: frozenset, vec, fullness: int, linear: float):
+        nonlocal counter
+        if names in seen:
+            return
+        named_recipe = find_named_recipe(list(names))
+        if named_recipe is not None:
+            # ネームド料理は合計に倍率をかけて満腹度ボーナスを足す（cookと同じ計算）
+            if named_recipe.nutrition_multiplier != 1.0:
+                vec = tuple(int(v * named_recipe.nutrition_multiplier) for v in vec)
+            fullness += named_recipe.fullness_bonus
+        if require_nutrition_good and not scorer.nutrition_good(vec):
+            return
+        score = scorer.score(vec, fullness, linear)
+        if score <= threshold():
+            return
+        seen.add(names)
+        counter += 1
+        entry = (score, counter, names, vec, fullness)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        else:
+            heapq.heapreplace(best, entry)
+
+    # ネームド料理：作れるものを個別に評価
+    for recipe in get_named_recipes_for_mask(stock.get_mask()):
+        if len(recipe.ingredients) > max_ingredients:
+            continue
+        vec = (0, 0, 0, 0, 0)
+        fullness = 0
+        linear = 0.0
+        for name in recipe.ingredients:
+            item = item_by_name[name]
+            vec = _add(vec, item.vec)
+            fullness += item.fullness
+            linear += item.linear
+        record(recipe.ingredients, vec, fullness, linear)
+
+    # ネームド料理以外：分枝限定法
+    # 各ノードで残りの食材を増分の大きい順に並べ、i番目を選ぶ枝ではi番目以降だけを候補にする。
+    # 増分が0以下の食材は、この先どう足しても評価値を上げない（劣モジュラ性）ので候補から外す。
+    root = [(0.0, item, scorer.modular(item)) for item in items]
+
+    def search(candidates, chosen: list[str], vec, fullness: int, linear: float, score: float):
+        if chosen:
+            record(frozenset(chosen), vec, fullness, linear)
+        remaining = max_ingredients - len(chosen)
+        if remaining <= 0:
+            return
+
+        # 増分 = 不足の残りを埋める量 + 足し算部分 + 満腹度の余地を埋める量
+        w_coverage = weights.coverage
+        w_fullness = weights.fullness
+        t = scorer.threshold
+        d0, d1, d3 = (max(0, t - scorer.base[k] - vec[k]) for k in _KEY_NUTRIENTS)
+        room = max(0, scorer.room - fullness)
+        children = []
+        for _, item, modular in candidates:
+            v = item.vec
+            gain = (w_coverage * (min(v[0], d0) + min(v[1], d1) + min(v[3], d3))
+                    + w_fullness * min(item.fullness, room) + modular)
+            if gain > 0:
+                children.append((gain, item, modular))
+        if not children:
+            return
+        children.sort(key=lambda child: child[0], reverse=True)
+
+        # 上界（i番目の食材と、i+1番目以降から最大remaining-1個を足したときの増分）:
+        #   増分の上位remaining個の合計（劣モジュラ性）と、
+        #   i番目の足し算部分 + i+1番目以降の足し算部分の上位 + 不足の穴埋め・満腹度の残り
+        # の小さい方
+        cap = scorer.saturating_cap(vec, fullness)
+        n = len(children)
+        bounds = [0.0] * n
+        top_modular: list[float] = []
+        rest_modular = 0.0
+        for i in range(n - 1, -1, -1):
+            gain_bound = sum(child[0] for child in children[i:i + remaining])
+            bounds[i] = min(gain_bound, children[i][2] + rest_modular + cap)
+            if remaining > 1:
+                _push_top(top_modular, children[i][2], remaining - 1)
+                rest_modular = sum(top_modular)
+
+        for i, (gain, item, _) in enumerate(children):
+            if score + bounds[i] <= threshold():
+                continue  # 足し算部分の上界はiについて単調でないので打ち切らない
+            chosen.append(item.name)
+            search(children[i + 1:], chosen,
+                   _add(vec, item.vec), fullness + item.fullness, linear + item.linear, score + gain)
+            chosen.pop()
+
+    search(root, [], (0, 0, 0, 0, 0), 0, 0.0, 0.0)
+
+    plans = []
+    for score, _, names, vec, fullness in sorted(best, reverse=True):
+        # 在庫の並び順で食材名を並べる
+        ingredient_names = [item.name for item in items if item.name in names]
+        named_recipe = find_named_recipe(ingredient_names)
+        if named_recipe:
+            dish_name = named_recipe.name
+        else:
+            dish_name = SIMPLE_RECIPES.get(names, 'ミックス料理')
+        plans.append(MealPlan(
+            ingredients=ingredient_names,
+            dish_name=dish_name,
+            nutrition=Nutrition(*vec),
+            fullness=fullness,
+            score=score,
+            named_recipe_name=named_recipe.name if named_recipe else None,
+            evaluation=evaluate_cooking(ingredient_names, meal_nutrition, meal_fullness),
+        ))
+    return plans
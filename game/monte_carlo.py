@@ -0,0 +1,149 @@
+"""モンテカルロ・シミュレーション
+
+シード × キャラクター × 方針 の全組み合わせをヘッドレスでプレイし、
+GameResult.to_dict() の行を返す。ProcessPoolExecutorで全コアに分散する。
+
+ワーカーは長寿命で、親プロセスからはシードの範囲と設定（キャラクターID・方針名）
+だけを受け取る。GameManagerはワーカー内で作って捨てるので、pickleされるのは
+結果の行（dict）だけ。
+
+使用例:
+    python -m game.monte_carlo --seeds 1000 --characters regular,freelance \\
+        --policies planner,greedy --out results.csv
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator
+
+from .simulation import DEFAULT_POLICY, POLICIES, run_game, run_games_lockstep
+
+
+# 1タスクあたりのゲーム数（タスク投入・結果返送のオーバーヘッドを薄める）
+DEFAULT_CHUNK_SIZE = 250
+
+
+def _run_chunk(seed_start: int, seed_end: int, character_id: str,
+               policy_name: str, config_name: str, lockstep: bool = False) -> list[dict]:
+    """ワーカー側：シード範囲をプレイして結果行を返す
+
+    lockstepならチャンク内のゲームを足並みをそろえて進め、イベント判定をまとめて行う。
+    """
+    policy = POLICIES[policy_name]()
+    seeds = range(seed_start, seed_end)
+    if lockstep:
+        results = run_games_lockstep(policy, seeds, character_id=character_id,
+                                     config_name=config_name, batch_seed=seed_start)
+    else:
+        results = [run_game(policy, character_id=character_id, seed=seed, config_name=config_name)
+                   for seed in seeds]
+
+    rows = []
+    for result in results:
+        row = result.to_dict()
+        row["character_id"] = character_id
+        row["policy"] = policy_name
+        rows.append(row)
+    return rows
+
+
+def _make_chunks(seeds: range, character_ids: list[str], policy_names: list[str],
+                 chunk_size: int) -> list[tuple[int, int, str, str]]:
+    """(シード開始, シード終了, キャラクターID, 方針名) のタスクに分割"""
+    chunks = []
+    for character_id in character_ids:
+        for policy_name in policy_names:
+            for start in range(seeds.start, seeds.stop, chunk_size):
+                chunks.append((start, min(start + chunk_size, seeds.stop), character_id, policy_name))
+    return chunks
+
+
+def run_monte_carlo(
+    seeds: range,
+    character_ids: list[str],
+    policy_names: list[str],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    config_name: str = "default",
+    lockstep: bool = False,
+) -> Iterator[dict]:
+    """全組み合わせをプレイし、結果行を完了順に返す
+
+    Args:
+        seeds: プレイするシードの範囲
+        character_ids: キャラクターIDのリスト
+        policy_names: 方針名のリスト（simulation.POLICIESのキー）
+        workers: ワーカープロセス数（Noneで全コア、1ならプロセスを使わない）
+        chunk_size: 1タスクあたりのシード数
+        config_name: 結果に記録する設定名
+        lockstep: チャンク内のイベント判定をまとめて行う（event_batch、結果はシード単位では再現しない）
+
+    Yields:
+        GameResult.to_dict() に character_id と policy を加えた行
+    """
+    unknown = [name for name in policy_names if name not in POLICIES]
+    if unknown:
+        raise ValueError(f"未知の方針: {', '.join(unknown)}")
+
+    chunks = _make_chunks(seeds, character_ids, policy_names, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _run_chunk(*chunk, config_name, lockstep)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_chunk, *chunk, config_name, lockstep) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def write_csv(rows: Iterator[dict], out) -> int:
+    """結果行をCSVに書き出し、書いた行数を返す"""
+    writer = None
+    count = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row.keys()))
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="モンテカルロ・シミュレーション")
+    parser.add_argument("--seeds", type=int, default=1000, help="シード数")
+    parser.add_argument("--seed-start", type=int, default=0, help="開始シード")
+    parser.add_argument("--characters", default="regular", help="キャラクターID（カンマ区切り）")
+    parser.add_argument("--policies", default=DEFAULT_POLICY, help="方針名（カンマ区切り）")
+    parser.add_argument("--workers", type=int, default=None, help="ワーカー数（省略時は全コア）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="1タスクのシード数")
+    parser.add_argument("--config-name", default="default", help="結果に記録する設定名")
+    parser.add_argument("--lockstep", action="store_true", help="イベント判定をチャンク単位でまとめて行う")
+    parser.add_argument("--out", default=None, help="出力CSV（省略時は標準出力）")
+    args = parser.parse_args()
+
+    seeds = range(args.seed_start, args.seed_start + args.seeds)
+    rows = run_monte_carlo(
+        seeds,
+        character_ids=args.characters.split(","),
+        policy_names=args.policies.split(","),
+        workers=args.workers or os.cpu_count(),
+        chunk_size=args.chunk_size,
+        config_name=args.config_name,
+        lockstep=args.lockstep,
+    )
+
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            count = write_csv(rows, f)
+        print(f"{count}件の結果を {args.out} に出力しました", file=sys.stderr)
+    else:
+        write_csv(rows, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
 """栄養システム"""
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from .constants import NUTRITION_MIN_THRESHOLD, PENALTY_VITALITY, PENALTY_MENTAL, PENALTY_SUSTAIN
 
 
-@dataclass
+# 栄養素の並び順（to_row/from_rowの列順）
+NUTRITION_FIELDS = ('vitality', 'mental', 'awakening', 'sustain', 'defense')
+
+
+@dataclass(slots=True)
 class Nutrition:
-    """栄養素5種を管理するクラス"""
+    """栄養素5種を管理するクラス
+
+    __slots__ で属性辞書を持たない。調理の集計ループでは一時オブジェクトを作らないよう
+    add / add_scaled / scale で自身を直接書き換える。
+    """
     vitality: int = 0   # 活力素: 体力回復
     mental: int = 0     # 心力素: 気力回復
     awakening: int = 0  # 覚醒素: 目覚め（Phase 1では未使用）
@@ -20,6 +29,48 @@ class Nutrition:
         self.sustain += other.sustain
         self.defense += other.defense
 
+    def __iadd__(self, other: 'Nutrition') -> 'Nutrition':
+        """n += other（addと同じ、自身を返す）"""
+        self.add(other)
+        return self
+
+    def add_scaled(self, other: 'Nutrition', k: float):
+        """other に k をかけた値を加算する
+
+        各栄養素ごとに int() で切り捨ててから足すので、
+        self.add(other.apply_modifier(k)) と同じ結果になる。
+        """
+        self.vitality += int(other.vitality * k)
+        self.mental += int(other.mental * k)
+        self.awakening += int(other.awakening * k)
+        self.sustain += int(other.sustain * k)
+        self.defense += int(other.defense * k)
+
+    def scale(self, k: float):
+        """自身に k をかける（apply_modifierの破壊的版）"""
+        self.vitality = int(self.vitality * k)
+        self.mental = int(self.mental * k)
+        self.awakening = int(self.awakening * k)
+        self.sustain = int(self.sustain * k)
+        self.defense = int(self.defense * k)
+
+    def copy(self) -> 'Nutrition':
+        """同じ値の新しいNutritionを返す"""
+        return Nutrition(self.vitality, self.mental, self.awakening, self.sustain, self.defense)
+
+    def to_row(self) -> tuple[int, int, int, int, int]:
+        """NUTRITION_FIELDS順のタプルにする
+
+        numpy.array([n.to_row() for n in nutritions]) で (件数, 5) の行列にまとめられる。
+        """
+        return (self.vitality, self.mental, self.awakening, self.sustain, self.defense)
+
+    @classmethod
+    def from_row(cls, row: Iterable) -> 'Nutrition':
+        """NUTRITION_FIELDS順の5要素（タプル・リスト・NumPyの行など）から作る"""
+        vitality, mental, awakening, sustain, defense = (int(v) for v in row)
+        return cls(vitality, mental, awakening, sustain, defense)
+
     def apply_modifier(self, modifier: float) -> 'Nutrition':
         """補正値を適用した新しいNutritionを返す"""
         return Nutrition(
@@ -93,6 +93,7 @@ class ProvisionStock:
     """食糧ストック管理（通販食品 + 弁当などの調理済み料理）"""
 
     def __init__(self):
+        self.version = 0  # 中身（通販食品・調理済み・配送待ち）が変わるたびに増える
         self._items: dict[str, int] = {}  # 通販食品
         self._prepared: list[PreparedDish] = []  # 弁当など調理済み
         self._pending: list[PendingDelivery] = []  # 配送待ち
@@ -101,6 +102,7 @@ class ProvisionStock:
 
     def add(self, name: str, quantity: int = 1):
         """食糧を追加"""
+        self.version += 1
         if name not in self._items:
             self._items[name] = 0
         self._items[name] += quantity
@@ -108,6 +110,7 @@ class ProvisionStock:
     def remove(self, name: str, quantity: int = 1) -> bool:
         """食糧を消費。成功したらTrue"""
         if name in self._items and self._items[name] >= quantity:
+            self.version += 1
             self._items[name] -= quantity
             if self._items[name] == 0:
                 del self._items[name]
@@ -143,6 +146,7 @@ class ProvisionStock:
             dish_type=dish_type
         )
         self._prepared.append(prepared)
+        self.version += 1
 
     def get_prepared(self, current_day: int) -> list[PreparedDish]:
         """有効な調理済み料理のリストを取得（期限内のもの）"""
@@ -154,13 +158,16 @@ class ProvisionStock:
         if 0 <= index < len(valid_prepared):
             dish = valid_prepared[index]
             self._prepared.remove(dish)
+            self.version += 1
             return dish
         return None
 
     def remove_expired_prepared(self, current_day: int) -> list[PreparedDish]:
         """期限切れの調理済み料理を削除して返す"""
         expired = [p for p in self._prepared if p.expiry_day < current_day]
-        self._prepared = [p for p in self._prepared if p.expiry_day >= current_day]
+        if expired:
+            self._prepared = [p for p in self._prepared if p.expiry_day >= current_day]
+            self.version += 1
         return expired
 
     def has_prepared(self, current_day: int) -> bool:
@@ -189,6 +196,7 @@ class ProvisionStock:
             quantity=quantity,
             delivery_day=delivery_day
         ))
+        self.version += 1
 
     def get_pending(self) -> list[PendingDelivery]:
         """配送待ちリストを取得"""
@@ -210,7 +218,9 @@ class ProvisionStock:
             else:
                 remaining.append(item)
 
-        self._pending = remaining
+        if delivered:
+            self._pending = remaining
+            self.version += 1
         return delivered
 
     def has_pending(self) -> bool:
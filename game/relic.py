@@ -1,4 +1,5 @@
 """レリック（調理器具など）システム"""
+import bisect
 import random
 from dataclasses import dataclass
 
@@ -464,15 +465,19 @@ class ShopRelicItem:
 
 
 def generate_daily_relic_items(seed: int | None = None,
-                                owned_relics: set[str] | None = None) -> list[ShopRelicItem]:
+                                owned_relics: set[str] | None = None,
+                                rng: random.Random | None = None) -> list[ShopRelicItem]:
     """その日の通販レリックを生成（5種類、1つセール）
 
     Args:
         seed: 乱数シード
         owned_relics: 所持済みレリック名のセット（除外用）
+        rng: seedがない場合に使う乱数（省略時はグローバルなrandom）
     """
     if seed is not None:
-        random.seed(seed + 1000)  # 食材とシードをずらす
+        rng = random.Random(seed + 1000)  # 食材とシードをずらす
+    elif rng is None:
+        rng = random
 
     # 所持済みレリックを除外
     all_relics = list(RELICS.values())
@@ -480,11 +485,11 @@ def generate_daily_relic_items(seed: int | None = None,
         all_relics = [r for r in all_relics if r.name not in owned_relics]
 
     # 利用可能なレリックが5種類未満の場合は全て表示
-    selected = random.sample(all_relics, min(5, len(all_relics)))
+    selected = rng.sample(all_relics, min(5, len(all_relics)))
 
     shop_items = []
     if selected:
-        sale_idx = random.randint(0, len(selected) - 1)
+        sale_idx = rng.randint(0, len(selected) - 1)
 
         for i, relic in enumerate(selected):
             if i == sale_idx:
@@ -497,11 +502,77 @@ def generate_daily_relic_items(seed: int | None = None,
     return shop_items
 
 
+class _AcquisitionTimeline:
+    """取得日の昇順に並べた効果値と、その累計（取得日による絞り込みを二分探索で行う）"""
+
+    def __init__(self):
+        self._days: list[int] = []    # 取得日（昇順）
+        self._totals: list[int] = []  # 先頭からその位置までの効果値の累計
+
+    def insert(self, day: int, value: int):
+        """効果を追加（同じ取得日なら後から追加した方を後ろに）"""
+        i = bisect.bisect_right(self._days, day)
+        before = self._totals[i - 1] if i else 0
+        self._days.insert(i, day)
+        self._totals.insert(i, before + value)
+        for j in range(i + 1, len(self._totals)):
+            self._totals[j] += value
+
+    def _sum_first(self, count: int) -> int:
+        return self._totals[count - 1] if count else 0
+
+    def total(self) -> int:
+        """全効果の合計"""
+        return self._sum_first(len(self._days))
+
+    def total_through(self, day: int) -> int:
+        """取得日がday以前の効果の合計"""
+        return self._sum_first(bisect.bisect_right(self._days, day))
+
+    def total_before(self, day: int) -> int:
+        """取得日がdayより前の効果の合計"""
+        return self._sum_first(bisect.bisect_left(self._days, day))
+
+
 class RelicInventory:
-    """所持レリック管理"""
+    """所持レリック管理
+
+    効果の合計は効果タイプ・対象ごとに集計しておき、add()で所持レリックが
+    変わったときだけ作り直す（各getterは辞書を引くだけ）。
+    取得日で効果が変わる鮮度延長・バッグ容量は取得日のタイムライン（累計つき）で持つ。
+    """
 
     def __init__(self):
         self._owned: dict[str, int] = {}  # レリック名 → 取得日
+        self.version = 0  # 所持レリックが変わるたびに増える（効果のキャッシュ判定用）
+        self._freshness_timeline = _AcquisitionTimeline()
+        self._bag_timeline = _AcquisitionTimeline()
+        self._rebuild_effects()
+
+    def _rebuild_effects(self):
+        """所持レリックの効果を集計する"""
+        owned = [(RELICS[name], day) for name, day in self._owned.items() if name in RELICS]
+
+        def by_target(effect_type: str, to_value) -> tuple[dict[str, float | int], float | int]:
+            """(対象 → 合計, 対象なし（全体）の合計)。合計の順序は取得順（元の計算と同じ）"""
+            relics = [relic for relic, _ in owned if relic.effect_type == effect_type]
+            total = 0
+            for relic in relics:
+                if relic.effect_target is None:
+                    total += to_value(relic.effect_value)
+            per_target = {}
+            for target in {relic.effect_target for relic in relics if relic.effect_target is not None}:
+                value = 0
+                for relic in relics:
+                    if relic.effect_target is None or relic.effect_target == target:
+                        value += to_value(relic.effect_value)
+                per_target[target] = value
+            return per_target, total
+
+        self._nutrition_boost, self._nutrition_boost_all = by_target('nutrition_boost', lambda v: v)
+        self._fullness_boost, self._fullness_boost_all = by_target('fullness_boost', int)
+        self._energy_save = sum(
+            int(relic.effect_value) for relic, _ in owned if relic.effect_type == 'energy_save')
 
     def add(self, name: str, acquired_day: int = 1) -> bool:
         """レリックを追加。既に持っていればFalse
@@ -512,6 +583,13 @@ class RelicInventory:
         if name in self._owned:
             return False
         self._owned[name] = acquired_day
+        self.version += 1
+        self._rebuild_effects()
+        relic = RELICS.get(name)
+        if relic and relic.effect_type == 'freshness_extend':
+            self._freshness_timeline.insert(acquired_day, int(relic.effect_value))
+        elif relic and relic.effect_type == 'bag_capacity':
+            self._bag_timeline.insert(acquired_day, int(relic.effect_value))
         return True
 
     def has(self, name: str) -> bool:
@@ -532,41 +610,19 @@ class RelicInventory:
 
     def get_nutrition_boost(self, ingredient_name: str) -> float:
         """指定食材の栄養ブースト倍率を取得"""
-        boost = 0.0
-        for relic_name in self._owned:
-            relic = RELICS.get(relic_name)
-            if relic and relic.effect_type == 'nutrition_boost':
-                if relic.effect_target is None or relic.effect_target == ingredient_name:
-                    boost += relic.effect_value
-        return boost
+        return self._nutrition_boost.get(ingredient_name, self._nutrition_boost_all)
 
     def get_fullness_boost(self, ingredient_name: str) -> int:
         """指定食材の満腹度ブースト値を取得"""
-        boost = 0
-        for relic_name in self._owned:
-            relic = RELICS.get(relic_name)
-            if relic and relic.effect_type == 'fullness_boost':
-                if relic.effect_target is None or relic.effect_target == ingredient_name:
-                    boost += int(relic.effect_value)
-        return boost
+        return self._fullness_boost.get(ingredient_name, self._fullness_boost_all)
 
     def get_energy_save(self) -> int:
         """調理時の気力消費軽減値を取得"""
-        save = 0
-        for relic_name in self._owned:
-            relic = RELICS.get(relic_name)
-            if relic and relic.effect_type == 'energy_save':
-                save += int(relic.effect_value)
-        return save
+        return self._energy_save
 
     def get_freshness_extend(self) -> int:
         """鮮度延長日数を取得（全レリックの合計）"""
-        extend = 0
-        for relic_name in self._owned:
-            relic = RELICS.get(relic_name)
-            if relic and relic.effect_type == 'freshness_extend':
-                extend += int(relic.effect_value)
-        return extend
+        return self._freshness_timeline.total()
 
     def get_freshness_extend_for_purchase_day(self, purchase_day: int) -> int:
         """指定購入日の食材に適用される鮮度延長日数を取得
@@ -581,16 +637,9 @@ class RelicInventory:
         Returns:
             適用される鮮度延長日数
         """
-        extend = 0
-        for relic_name, acquired_day in self._owned.items():
-            # レリック取得日 <= 食材購入日 の場合のみ効果を適用
-            # （レリックを持っている状態で購入した食材のみ恩恵を受ける）
-            if acquired_day > purchase_day:
-                continue
-            relic = RELICS.get(relic_name)
-            if relic and relic.effect_type == 'freshness_extend':
-                extend += int(relic.effect_value)
-        return extend
+        # レリック取得日 <= 食材購入日 の場合のみ効果を適用
+        # （レリックを持っている状態で購入した食材のみ恩恵を受ける）
+        return self._freshness_timeline.total_through(purchase_day)
 
     def get_bag_capacity_boost(self, current_day: int | None = None) -> int:
         """買い物バッグ容量の増加値を取得
@@ -599,15 +648,10 @@ class RelicInventory:
             current_day: 現在のゲーム日。指定時、当日以降に取得したレリックは除外
                         （買い物は帰宅前なので、当日届いたレリックは翌日から有効）
         """
-        boost = 0
-        for relic_name, acquired_day in self._owned.items():
-            # 当日以降に取得したレリックは買い物に影響しない
-            if current_day is not None and acquired_day >= current_day:
-                continue
-            relic = RELICS.get(relic_name)
-            if relic and relic.effect_type == 'bag_capacity':
-                boost += int(relic.effect_value)
-        return boost
+        if current_day is None:
+            return self._bag_timeline.total()
+        # 当日以降に取得したレリックは買い物に影響しない
+        return self._bag_timeline.total_before(current_day)
 
     def add_initial_relics(self):
         """初期レリック（冷蔵庫・電子レンジ）を追加
@@ -76,7 +76,7 @@ class GameResult:
             'total_bonus_received': self.total_bonus_received,
             'days_with_balanced_nutrition': self.days_with_balanced_nutrition,
             'total_insomnia_nights': self.total_insomnia_nights,
-            'seed': self.seed or '',
+            'seed': self.seed if self.seed is not None else '',
             'config_name': self.config_name,
         }
         # 栄養ペナルティを展開
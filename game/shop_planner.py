@@ -0,0 +1,160 @@
+"""買い物かごプランナー（店頭商品から買う数量を決める）
+
+店頭商品ごとに「何個買うか」を選ぶ多重ナップサック問題として、
+バッグ容量と所持金の範囲で、この先horizon日間に食べる分の価値が最大になる数量を求める。
+
+価値の見積もり:
+    食材は1日1個ずつ、在庫の古いものから使うとみなす。
+    在庫にn個ある食材を追加で買ったk個目は n+k-1 日後に食べる想定で、
+    そのときの鮮度補正（freshness_days/decay_rate、期限近い半額品は残り日数）をかけた
+    栄養の合計 + 満腹度 を、1日ごとに daily_discount 倍して数える。
+    horizon日以内に食べきれない分は価値0。価格は price_weight 倍して差し引く。
+
+解き方:
+    商品ごとに 0〜max_per_item 個の選択肢があるグループナップサック。
+    使ったバッグ容量ごとに (費用, 価値) のパレート最適な状態だけを残して商品を1つずつ足していく。
+    店頭商品は5〜7種類・バッグ容量は十数個程度なので、状態数は小さい。
+"""
+from dataclasses import dataclass
+
+from .ingredients import ShopItem, Stock, freshness_modifier
+from .relic import RelicInventory
+
+
+DEFAULT_HORIZON = 5          # 価値を見積もる日数
+DEFAULT_DAILY_DISCOUNT = 0.9  # 1日先に食べる分の価値の割引率
+DEFAULT_PRICE_WEIGHT = 0.05   # 価格1円あたりに差し引く価値
+DEFAULT_MAX_PER_ITEM = 5      # 1商品あたりの最大購入数（店頭の在庫数）
+
+
+@dataclass
+class Basket:
+    """買い物かごの提案"""
+    items: list[tuple[str, int]]  # [(食材名, 数量), ...] 店頭の並び順
+    total_cost: int
+    total_units: int
+    value: float  # 見積もった価値（価格分を差し引き済み）
+
+
+def _effective_purchase_day(item: ShopItem, current_day: int) -> int:
+    """期限近い商品は購入日を前にずらして残り鮮度日数を合わせる（main._process_purchasesと同じ）"""
+    ingredient = item.ingredient
+    if item.freshness_days_left < ingredient.freshness_days:
+        return current_day - (ingredient.freshness_days - item.freshness_days_left)
+    return current_day
+
+
+def _unit_values(item: ShopItem, in_stock: int, current_day: int, relics: RelicInventory | None,
+                 horizon: int, daily_discount: float, price_weight: float, max_units: int) -> list[float]:
+    """1個目, 2個目, ... を買い足したときのそれぞれの価値（価格分を差し引き済み）"""
+    ingredient = item.ingredient
+    purchase_day = _effective_purchase_day(item, current_day)
+    extend_days = relics.get_freshness_extend_for_purchase_day(purchase_day) if relics else 0
+    nutrition_total = (ingredient.nutrition.vitality + ingredient.nutrition.mental
+                       + ingredient.nutrition.awakening + ingredient.nutrition.sustain
+                       + ingredient.nutrition.defense)
+    cost = price_weight * item.price
+
+    values = []
+    for k in range(max_units):
+        offset = in_stock + k  # 何日後に食べるか
+        if offset >= horizon:
+            values.append(-cost)
+            continue
+        elapsed = current_day + offset - purchase_day
+        modifier = freshness_modifier(ingredient, elapsed, extend_days)
+        value = (int(nutrition_total * modifier) + ingredient.fullness) * daily_discount ** offset
+        values.append(value - cost)
+    return values
+
+
+def _pareto(states: list[tuple[int, float, tuple[int, ...]]]) -> list[tuple[int, float, tuple[int, ...]]]:
+    """(費用, 価値, 数量) のうち、より安くて価値が同じか高い状態がないものだけ残す"""
+    states.sort(key=lambda state: (state[0], -state[1]))
+    front = []
+    best_value = float('-inf')
+    for state in states:
+        if state[1] > best_value:
+            front.append(state)
+            best_value = state[1]
+    return front
+
+
+def plan_basket(
+    shop_items: list[ShopItem],
+    stock: Stock,
+    current_day: int,
+    money: int,
+    bag_capacity: int,
+    relics: RelicInventory | None = None,
+    horizon: int = DEFAULT_HORIZON,
+    daily_discount: float = DEFAULT_DAILY_DISCOUNT,
+    price_weight: float = DEFAULT_PRICE_WEIGHT,
+    max_per_item: int = DEFAULT_MAX_PER_ITEM,
+) -> Basket:
+    """店頭商品から、バッグ容量と予算の範囲で価値が最大になる買い物かごを求める
+
+    Args:
+        shop_items: 店頭商品（generate_daily_shop_items / generate_distant_shop_itemsの戻り値）
+        stock: 食材ストック（既にある分は先に食べる想定）
+        current_day: 現在のゲーム日
+        money: 使ってよい金額
+        bag_capacity: バッグ容量（GameManager.get_bag_capacity()）
+        relics: レリックインベントリ（鮮度延長の適用用）
+        horizon: 価値を見積もる日数
+        daily_discount: 1日先に食べる分の価値の割引率
+        price_weight: 価格1円あたりに差し引く価値
+        max_per_item: 1商品あたりの最大購入数
+
+    Returns:
+        買い物かご（何も買わないのが最善なら空）
+    """
+    capacity = max(0, bag_capacity)
+    budget = max(0, money)
+
+    # fronts[使ったバッグ容量] = [(費用, 価値, 商品ごとの数量), ...]
+    fronts: list[list[tuple[int, float, tuple[int, ...]]]] = [[] for _ in range(capacity + 1)]
+    fronts[0].append((0, 0.0, ()))
+
+    for item in shop_items:
+        max_units = min(max_per_item, capacity)
+        if item.price > 0:
+            max_units = min(max_units, budget // item.price)
+        unit_values = _unit_values(
+            item, stock.get_quantity(item.ingredient.name), current_day, relics,
+            horizon, daily_discount, price_weight, max_units)
+
+        # q個買ったときの価値の累計
+        cumulative = [0.0]
+        for value in unit_values:
+            cumulative.append(cumulative[-1] + value)
+
+        next_fronts: list[list[tuple[int, float, tuple[int, ...]]]] = [[] for _ in range(capacity + 1)]
+        for used, front in enumerate(fronts):
+            for cost, value, quantities in front:
+                for q in range(max_units + 1):
+                    next_used = used + q
+                    next_cost = cost + item.price * q
+                    if next_used > capacity or next_cost > budget:
+                        break
+                    next_fronts[next_used].append((next_cost, value + cumulative[q], quantities + (q,)))
+        fronts = [_pareto(front) for front in next_fronts]
+
+    # 価値が最大の状態（同じなら安い方）
+    best_cost, best_value, best_quantities = 0, 0.0, ()
+    for front in fronts:
+        for cost, value, quantities in front:
+            if value > best_value or (value == best_value and cost < best_cost):
+                best_cost, best_value, best_quantities = cost, value, quantities
+
+    items = [
+        (item.ingredient.name, q)
+        for item, q in zip(shop_items, best_quantities)
+        if q > 0
+    ]
+    return Basket(
+        items=items,
+        total_cost=best_cost,
+        total_units=sum(q for _, q in items),
+        value=best_value,
+    )
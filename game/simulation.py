@@ -0,0 +1,786 @@
+"""ヘッドレス・シミュレーション
+
+ターミナルUIやAPIを介さずに、GameManagerだけで30日間のゲームを1回分
+プレイしてGameResultを返す。main.pyのhandle_*フェーズハンドラの代わりに、
+プレイヤーの意思決定を「方針（Policy）」オブジェクトに委ねる。
+
+使用例:
+    from game.simulation import run_game, PlannerPolicy
+    result = run_game(PlannerPolicy(), character_id='regular', seed=42)
+"""
+import random
+from typing import Iterable, Iterator
+
+from .player import Player
+from .ingredients import (
+    ShopItem, create_initial_stock, get_ingredient, generate_daily_shop_items,
+    generate_distant_shop_items,
+)
+from .cooking import cook, create_cafeteria_dish, get_named_recipes_for_mask
+from .meal_planner import plan_meal
+from .shop_planner import plan_basket
+from .nutrition import Nutrition
+from .day_cycle import GameManager, GamePhase, MealTime
+from .events import EventTiming
+from .event_batch import make_batch_rng, trigger_events_batch
+from .character import get_character, get_default_character
+from .provisions import get_provision
+from .relic import ShopRelicItem, generate_daily_relic_items
+from .result import GameResult
+from .constants import (
+    MAX_FULLNESS, CAFETERIA_PRICE, SHOPPING_ENERGY_COST, SHOPPING_STAMINA_COST,
+)
+
+
+# === 方針（Policy） ===
+
+class Policy:
+    """シミュレーション用の行動方針（基底クラス）
+
+    各メソッドがターミナルUIのメニュー選択に対応する。
+    基底クラスは「何もしない」方針で、サブクラスで必要なものだけ上書きする。
+    """
+    name = "idle"
+
+    def choose_meal(self, game: GameManager, meal: MealTime) -> str:
+        """食事の取り方を選ぶ
+
+        Returns:
+            "cook"（自炊）, "bento"（朝食の自炊 + 弁当作成、平日朝のみ）,
+            "cafeteria"（社食、平日昼のみ）, "provision"（食糧）, "skip"（抜く）
+        """
+        return "skip"
+
+    def select_ingredients(self, game: GameManager, meal_nutrition: Nutrition,
+                           meal_fullness: int) -> list[str]:
+        """調理に使う食材を選ぶ（空リストで調理終了）"""
+        return []
+
+    def select_bento_ingredients(self, game: GameManager) -> list[str]:
+        """弁当に使う食材を選ぶ（空リストで作らない）"""
+        return []
+
+    def select_provision(self, game: GameManager) -> tuple[str, str | int] | None:
+        """食べる食糧を選ぶ
+
+        Returns: ("provision", 食糧名) or ("prepared", インデックス) or None
+        """
+        return None
+
+    def should_go_shopping(self, game: GameManager) -> bool:
+        """平日の買い出しに行くか"""
+        return False
+
+    def choose_holiday_activity(self, game: GameManager, phase: GamePhase) -> str:
+        """休日の過ごし方を選ぶ（"shop", "distant", "batch", "rest", "skip"）"""
+        return "skip"
+
+    def select_purchases(self, game: GameManager, shop_items: list[ShopItem],
+                         bag_capacity: int) -> list[tuple[str, int]]:
+        """購入する食材を選ぶ
+
+        Returns: [(食材名, 数量), ...]
+        """
+        return []
+
+    def select_discards(self, game: GameManager,
+                        candidates: list[tuple[str, int, int, float]]) -> list[tuple[str, int]]:
+        """廃棄する食材を選ぶ
+
+        Args:
+            candidates: Stock.get_items_for_discardの戻り値
+        Returns: [(食材名, 廃棄数), ...]
+        """
+        return []
+
+    def select_online_orders(self, game: GameManager,
+                             relic_items: list[ShopRelicItem]) -> list[tuple[str, str, int]]:
+        """通販で注文する商品を選ぶ
+
+        Returns: [(item_type, 商品名, 数量), ...]  item_typeは"provision" or "relic"
+        """
+        return []
+
+    def reseed(self, seed: int):
+        """方針の乱数をシードで初期化し直す（run_gameがゲームごとに呼ぶ。乱数を持たない方針は何もしない）"""
+
+
+class GreedyPolicy(Policy):
+    """貪欲方針
+
+    作れるネームド料理があれば最も栄養の高いものを作り、なければ
+    栄養と満腹度の高い食材から3つ選んで調理する。平日昼は社食、
+    買い出しは栄養/価格の効率が良い順にバッグいっぱいまで買う。
+    """
+    name = "greedy"
+
+    def __init__(self, money_reserve: int = 3000, dish_size: int = 3):
+        self.money_reserve = money_reserve  # 買い物で残しておく所持金
+        self.dish_size = dish_size  # ネームド料理がないときの食材数
+
+    def choose_meal(self, game: GameManager, meal: MealTime) -> str:
+        if meal == MealTime.LUNCH and not game.is_holiday():
+            if game.can_use_cafeteria() and game.player.money - CAFETERIA_PRICE > self.money_reserve:
+                return "cafeteria"
+            return "provision" if not game.provisions.is_empty(game.day_state.day) else "skip"
+        if game.can_cook():
+            if (meal == MealTime.BREAKFAST and not game.is_holiday()
+                    and game.player.energy >= game.get_cooking_energy_cost() + game.get_bento_energy_cost()):
+                return "bento"
+            return "cook"
+        if not game.provisions.is_empty(game.day_state.day):
+            return "provision"
+        return "skip"
+
+    def select_ingredients(self, game: GameManager, meal_nutrition: Nutrition,
+                           meal_fullness: int) -> list[str]:
+        if meal_fullness >= MAX_FULLNESS:
+            return []
+        return self._pick_dish(game)
+
+    def select_bento_ingredients(self, game: GameManager) -> list[str]:
+        return self._pick_dish(game)
+
+    def _pick_dish(self, game: GameManager) -> list[str]:
+        """ネームド料理優先で食材を選ぶ"""
+        available = game.stock.get_available_ingredients()
+        if not available:
+            return []
+
+        recipes = get_named_recipes_for_mask(game.stock.get_mask())
+        if recipes:
+            def recipe_value(recipe) -> float:
+                total = 0
+                for name in recipe.ingredients:
+                    ing = get_ingredient(name)
+                    if ing:
+                        total += _nutrition_total(ing.nutrition) + ing.fullness
+                return total * recipe.nutrition_multiplier + recipe.fullness_bonus
+            best = max(recipes, key=recipe_value)
+            return list(best.ingredients)
+
+        def ingredient_value(name: str) -> int:
+            ing = get_ingredient(name)
+            if ing is None:
+                return 0
+            return _nutrition_total(ing.nutrition) + ing.fullness
+
+        ranked = sorted(available, key=ingredient_value, reverse=True)
+        return ranked[:self.dish_size]
+
+    def select_provision(self, game: GameManager) -> tuple[str, str | int] | None:
+        current_day = game.day_state.day
+        if game.provisions.get_prepared(current_day):
+            return ("prepared", 0)
+        # カフェイン飲料は不眠の原因になるので後回し
+        names = sorted(
+            game.provisions.get_available(),
+            key=lambda n: (get_provision(n).caffeine if get_provision(n) else 0,
+                           -(get_provision(n).fullness if get_provision(n) else 0)),
+        )
+        if names:
+            return ("provision", names[0])
+        return None
+
+    def should_go_shopping(self, game: GameManager) -> bool:
+        return game.player.money > self.money_reserve
+
+    def choose_holiday_activity(self, game: GameManager, phase: GamePhase) -> str:
+        if phase == GamePhase.HOLIDAY_SHOPPING_1 and game.can_go_shopping():
+            if game.player.money > self.money_reserve:
+                return "shop"
+        if game.player.energy < game.player.max_energy or game.player.stamina < game.player.max_stamina:
+            return "rest"
+        return "skip"
+
+    def select_purchases(self, game: GameManager, shop_items: list[ShopItem],
+                         bag_capacity: int) -> list[tuple[str, int]]:
+        budget = game.player.money - self.money_reserve
+
+        def efficiency(item: ShopItem) -> float:
+            ing = item.ingredient
+            return (_nutrition_total(ing.nutrition) + ing.fullness) / max(1, item.price)
+
+        purchases: dict[str, int] = {}
+        remaining = bag_capacity
+        # 効率の良い順に1個ずつ、バッグか予算が尽きるまで（1品目最大2個）
+        for _ in range(2):
+            for item in sorted(shop_items, key=efficiency, reverse=True):
+                if remaining <= 0:
+                    break
+                if item.price > budget:
+                    continue
+                name = item.ingredient.name
+                purchases[name] = purchases.get(name, 0) + 1
+                budget -= item.price
+                remaining -= 1
+        return list(purchases.items())
+
+    def select_discards(self, game: GameManager,
+                        candidates: list[tuple[str, int, int, float]]) -> list[tuple[str, int]]:
+        # 栄養が半分以下になったものは捨てる
+        return [(name, qty) for name, qty, _, modifier in candidates if modifier <= 0.5]
+
+
+class PlannerPolicy(GreedyPolicy):
+    """献立プランナー方針（シミュレーションの既定）
+
+    調理と弁当の食材選びをmeal_planner.plan_mealに、
+    買い物をshop_planner.plan_basketに任せる。
+    それ以外の行動は貪欲方針と同じ。
+    """
+    name = "planner"
+
+    def select_ingredients(self, game: GameManager, meal_nutrition: Nutrition,
+                           meal_fullness: int) -> list[str]:
+        if game.player.fullness >= MAX_FULLNESS:
+            return []
+        plans = plan_meal(
+            game.stock, game.day_state.day, game.relics,
+            meal_nutrition=meal_nutrition,
+            meal_fullness=game.player.fullness,
+            daily_nutrition=game.day_state.daily_nutrition,
+            top_k=1,
+        )
+        return plans[0].ingredients if plans else []
+
+    def select_bento_ingredients(self, game: GameManager) -> list[str]:
+        # 弁当は昼に食べるので、空腹・栄養ゼロの状態を基準にする
+        plans = plan_meal(game.stock, game.day_state.day, game.relics, top_k=1)
+        return plans[0].ingredients if plans else []
+
+    def select_purchases(self, game: GameManager, shop_items: list[ShopItem],
+                         bag_capacity: int) -> list[tuple[str, int]]:
+        budget = game.player.money - self.money_reserve
+        basket = plan_basket(shop_items, game.stock, game.day_state.day, budget,
+                             bag_capacity, game.relics)
+        return basket.items
+
+
+class RandomPolicy(Policy):
+    """ランダム方針（ベースライン比較用）
+
+    選択肢を一様に選ぶ。乱数は方針自身が持つので、同じシードなら同じ行動になる。
+    """
+    name = "random"
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+
+    def reseed(self, seed: int):
+        self.rng.seed(seed)
+
+    def choose_meal(self, game: GameManager, meal: MealTime) -> str:
+        options = ["skip"]
+        if game.can_cook():
+            options.append("cook")
+        if not game.provisions.is_empty(game.day_state.day):
+            options.append("provision")
+        if meal == MealTime.LUNCH and not game.is_holiday() and game.can_use_cafeteria():
+            options.append("cafeteria")
+        return self.rng.choice(options)
+
+    def select_ingredients(self, game: GameManager, meal_nutrition: Nutrition,
+                           meal_fullness: int) -> list[str]:
+        available = game.stock.get_available_ingredients()
+        if not available or self.rng.random() < 0.3:
+            return []
+        return self.rng.sample(available, self.rng.randint(1, min(4, len(available))))
+
+    def select_provision(self, game: GameManager) -> tuple[str, str | int] | None:
+        names = game.provisions.get_available()
+        if not names:
+            return None
+        return ("provision", self.rng.choice(names))
+
+    def should_go_shopping(self, game: GameManager) -> bool:
+        return self.rng.random() < 0.5
+
+    def choose_holiday_activity(self, game: GameManager, phase: GamePhase) -> str:
+        return self.rng.choice(["shop", "rest", "skip"])
+
+    def select_purchases(self, game: GameManager, shop_items: list[ShopItem],
+                         bag_capacity: int) -> list[tuple[str, int]]:
+        budget = game.player.money
+        purchases = []
+        for item in self.rng.sample(shop_items, len(shop_items)):
+            if bag_capacity <= 0:
+                break
+            qty = self.rng.randint(0, bag_capacity)
+            if qty and item.price * qty <= budget:
+                purchases.append((item.ingredient.name, qty))
+                budget -= item.price * qty
+                bag_capacity -= qty
+        return purchases
+
+
+# 方針レジストリ（名前 → クラス）
+POLICIES: dict[str, type[Policy]] = {
+    'idle': Policy,
+    'greedy': GreedyPolicy,
+    'planner': PlannerPolicy,
+    'random': RandomPolicy,
+}
+
+# 方針を指定しないときに使う方針
+DEFAULT_POLICY = 'planner'
+
+
+def get_policy(name: str = DEFAULT_POLICY) -> Policy | None:
+    """方針名から方針インスタンスを作成"""
+    policy_class = POLICIES.get(name)
+    if policy_class is None:
+        return None
+    return policy_class()
+
+
+def _nutrition_total(nutrition: Nutrition) -> int:
+    """栄養素5種の合計"""
+    return (nutrition.vitality + nutrition.mental + nutrition.awakening
+            + nutrition.sustain + nutrition.defense)
+
+
+# === ゲーム作成 ===
+
+def create_game(character_id: str | None = None, seed: int | None = None) -> GameManager:
+    """キャラクター設定を反映したGameManagerを作成（api.session.create_sessionと同じ初期化）"""
+    character = get_character(character_id) if character_id else None
+    if character is None:
+        character = get_default_character()
+
+    player = Player(
+        money=character.initial_money,
+        energy=character.initial_energy,
+        stamina=character.initial_stamina,
+    )
+    return GameManager(
+        player, create_initial_stock(),
+        has_bonus=character.has_bonus,
+        salary_amount=character.salary_amount,
+        bonus_amount=character.bonus_amount,
+        rent_amount=character.rent_amount,
+        character_id=character.id,
+        seed=seed,
+    )
+
+
+# === フェーズ処理 ===
+#
+# イベントが起きるフェーズの処理関数はジェネレータで、イベント判定のタイミングで
+# EventTimingをyieldする。判定は呼び出し側が行うので、1ゲームずつ判定する
+# （play_phase）ことも、複数ゲームをまとめて判定する（run_games_lockstep）こともできる。
+
+def _trigger_events(game: GameManager, timing: EventTiming):
+    """指定タイミングのイベントを発生させる"""
+    context = game.get_event_context()
+    game.events.check_and_trigger_events(timing, context, game)
+
+
+def _cook_dishes(game: GameManager, policy: Policy) -> bool:
+    """複数の料理を作って食べる（main.cook_multiple_dishes相当）。1品以上作ったらTrue"""
+    current_day = game.day_state.day
+    meal_nutrition = Nutrition()
+    meal_fullness = 0
+    cooked = False
+
+    while game.can_cook() and game.player.fullness < MAX_FULLNESS:
+        ingredients = policy.select_ingredients(game, meal_nutrition, meal_fullness)
+        if not ingredients:
+            break
+        dish = cook(ingredients, game.stock, current_day, game.relics)
+        if dish is None:
+            break
+        game.consume_cooking_energy()
+        game.eat_dish(dish)
+        game.stats.record_meal_eaten()
+        game.stats.record_cooking()
+        game.record_behavior_cook()
+        game.record_daily_cook()
+        meal_nutrition.add(dish.nutrition)
+        meal_fullness += dish.fullness
+        cooked = True
+
+    return cooked
+
+
+def _make_bento(game: GameManager, policy: Policy):
+    """弁当を1つ作る"""
+    if not game.can_make_bento():
+        return
+    ingredients = policy.select_bento_ingredients(game)
+    if not ingredients:
+        return
+    bento = cook(ingredients, game.stock, game.day_state.day, game.relics)
+    if bento:
+        game.consume_bento_energy()
+        game.add_bento(bento)
+        game.stats.record_bento()
+
+
+def _eat_provisions(game: GameManager, policy: Policy) -> bool:
+    """食糧を食べる（main.eat_provision相当）。1つ以上食べたらTrue"""
+    current_day = game.day_state.day
+    ate = False
+
+    while not game.provisions.is_empty(current_day) and game.player.fullness < MAX_FULLNESS:
+        choice = policy.select_provision(game)
+        if choice is None:
+            break
+        item_type, value = choice
+
+        if item_type == "prepared":
+            dish = game.provisions.remove_prepared(value)
+            if dish is None:
+                break
+            game.player.add_fullness(dish.fullness)
+            game.day_state.daily_nutrition.add(dish.nutrition)
+        else:
+            prov = get_provision(value)
+            if prov is None or not game.provisions.remove(value, 1):
+                break
+            game.player.add_fullness(prov.fullness)
+            game.day_state.daily_nutrition.add(prov.nutrition)
+            if prov.caffeine > 0:
+                game.add_caffeine(prov.caffeine)
+                game.player.energy = min(game.player.energy + prov.caffeine * 2, 10)
+
+        game.stats.record_meal_eaten()
+        ate = True
+
+    return ate
+
+
+def _eat_meal(game: GameManager, policy: Policy, meal: MealTime):
+    """食事フェーズ共通処理"""
+    game.reset_fullness_for_meal()
+    choice = policy.choose_meal(game, meal)
+
+    if choice in ("cook", "bento"):
+        ate = _cook_dishes(game, policy)
+        if choice == "bento" and meal == MealTime.BREAKFAST and not game.is_holiday():
+            _make_bento(game, policy)
+        if not ate:
+            game.stats.record_meal_skipped()
+
+    elif choice == "cafeteria" and meal == MealTime.LUNCH and game.can_use_cafeteria():
+        game.consume_cafeteria_cost()
+        game.eat_dish(create_cafeteria_dish())
+        game.stats.record_meal_eaten()
+        game.stats.record_cafeteria()
+        game.record_behavior_eat_out()
+        game.record_food_spending(CAFETERIA_PRICE)
+
+    elif choice == "provision":
+        if not _eat_provisions(game, policy):
+            game.stats.record_meal_skipped()
+
+    else:
+        game.stats.record_meal_skipped()
+
+
+def _buy(game: GameManager, policy: Policy, shop_items: list[ShopItem], bag_capacity: int):
+    """店頭商品の購入処理（main._process_purchases相当）"""
+    current_day = game.day_state.day
+    shop_item_map = {item.ingredient.name: item for item in shop_items}
+    total_cost = 0
+    total_items = 0
+
+    for name, qty in policy.select_purchases(game, shop_items, bag_capacity):
+        item = shop_item_map.get(name)
+        if item is None or qty <= 0:
+            continue
+        qty = min(qty, bag_capacity - total_items)
+        cost = item.price * qty
+        if qty <= 0 or cost > game.player.money:
+            continue
+        ingredient = item.ingredient
+        # 期限近い商品は「有効購入日」を調整して鮮度を短く
+        if item.freshness_days_left < ingredient.freshness_days:
+            effective_day = current_day - (ingredient.freshness_days - item.freshness_days_left)
+        else:
+            effective_day = current_day
+        game.player.consume_money(cost)
+        game.stock.add(name, qty, effective_day)
+        total_cost += cost
+        total_items += qty
+
+    if total_items > 0:
+        game.stats.record_shopping(total_cost, total_items)
+        game.record_behavior_shop()
+        game.record_behavior_spending(total_cost)
+        game.record_food_spending(total_cost)
+
+    # 帰宅後：期限切れ食材の廃棄
+    if game.stock.has_expired_items(current_day, game.relics):
+        candidates = game.stock.get_items_for_discard(current_day, game.relics)
+        for name, qty in policy.select_discards(game, candidates):
+            game.stock.discard(name, qty)
+
+
+def _phase_breakfast(game: GameManager, policy: Policy):
+    """朝食フェーズ（起床処理・給料日チェックを含む）"""
+    game.determine_weather()
+    yield EventTiming.WAKE_UP
+
+    if game.is_payday():
+        game.pay_salary()
+        if game.is_bonus_day():
+            game.pay_bonus()
+
+    _eat_meal(game, policy, MealTime.BREAKFAST)
+
+
+def _phase_go_to_work(game: GameManager, policy: Policy):
+    """出勤フェーズ"""
+    yield EventTiming.GO_TO_WORK
+    game.commute()
+
+
+def _phase_lunch(game: GameManager, policy: Policy):
+    """昼食フェーズ（平日）"""
+    _eat_meal(game, policy, MealTime.LUNCH)
+    yield EventTiming.AFTER_LUNCH
+
+
+def _phase_leave_work(game: GameManager, policy: Policy):
+    """退勤フェーズ（金曜は週間ボス判定）"""
+    yield EventTiming.LEAVE_WORK
+    game.commute()
+    if game.is_friday() and game.current_boss is not None:
+        game.execute_friday_boss_event()
+
+
+def _phase_shopping(game: GameManager, policy: Policy):
+    """買い出しフェーズ（平日）"""
+    if not game.can_go_shopping() or not policy.should_go_shopping(game):
+        return
+    game.go_shopping()
+    yield EventTiming.AT_SHOP
+    shop_items = generate_daily_shop_items(seed=game.session_seed + game.day_state.day)
+    _buy(game, policy, shop_items, game.get_bag_capacity())
+
+
+def _phase_holiday_shopping(game: GameManager, policy: Policy):
+    """休日の買い出しフェーズ（main.handle_holiday_shopping相当）"""
+    phase = game.get_current_phase()
+    current_day = game.day_state.day
+    choice = policy.choose_holiday_activity(game, phase)
+
+    if choice == "shop" and game.can_go_shopping():
+        game.go_shopping()
+        yield EventTiming.AT_SHOP
+        phase_offset = 100 if phase == GamePhase.HOLIDAY_SHOPPING_2 else 0
+        shop_items = generate_daily_shop_items(seed=game.session_seed + current_day + phase_offset)
+        _buy(game, policy, shop_items, game.get_bag_capacity())
+
+    elif choice == "distant" and game.player.energy >= SHOPPING_ENERGY_COST * 2:
+        game.player.consume_energy(SHOPPING_ENERGY_COST * 2)
+        game.player.consume_stamina(SHOPPING_STAMINA_COST * 2)
+        yield EventTiming.AT_SHOP
+        shop_items = generate_distant_shop_items(seed=game.session_seed + current_day)
+        _buy(game, policy, shop_items, game.get_bag_capacity() * 2)
+
+    elif choice == "batch":
+        while game.can_cook():
+            ingredients = policy.select_bento_ingredients(game)
+            if not ingredients:
+                break
+            bento = cook(ingredients, game.stock, current_day, game.relics)
+            if bento is None:
+                break
+            game.consume_cooking_energy()
+            game.provisions.add_prepared(
+                dish_name=bento.name,
+                nutrition=bento.nutrition,
+                fullness=bento.fullness,
+                expiry_day=current_day + 1,
+                dish_type="作り置き"
+            )
+            game.stats.record_bento()
+
+    elif choice == "rest":
+        game.player.recover_energy(2)
+        game.player.recover_stamina(1)
+        game.record_behavior_rest()
+
+
+def _phase_holiday_lunch(game: GameManager, policy: Policy):
+    """昼食フェーズ（休日）"""
+    _eat_meal(game, policy, MealTime.LUNCH)
+
+
+def _phase_dinner(game: GameManager, policy: Policy):
+    """夕食フェーズ（配送処理・帰宅後イベントを含む）"""
+    game.process_deliveries()
+    yield EventTiming.AFTER_WORK
+    _eat_meal(game, policy, MealTime.DINNER)
+
+
+def _phase_online_shopping(game: GameManager, policy: Policy):
+    """通販フェーズ（カード払い・翌日配送）"""
+    owned = set(game.relics.get_all())
+    pending = {p.name for p in game.provisions.get_pending() if p.item_type == "relic"}
+    relic_items = generate_daily_relic_items(
+        seed=game.session_seed + game.day_state.day,
+        owned_relics=owned | pending,
+    )
+    relic_prices = {item.relic.name: item.price for item in relic_items}
+
+    ordered = False
+    for item_type, name, qty in policy.select_online_orders(game, relic_items):
+        if item_type == "relic":
+            if name not in relic_prices or name in owned or name in pending:
+                continue
+            game.player.add_card_debt(relic_prices[name])
+            game.add_pending_delivery("relic", name, 1)
+            pending.add(name)
+            ordered = True
+        elif item_type == "provision":
+            prov = get_provision(name)
+            if prov is None or qty <= 0:
+                continue
+            game.player.add_card_debt(prov.price * qty)
+            game.add_pending_delivery("provision", name, qty)
+            ordered = True
+
+    if ordered:
+        game.record_behavior_online_shop()
+
+
+def _phase_sleep(game: GameManager, policy: Policy):
+    """就寝フェーズ"""
+    yield EventTiming.NIGHT
+    game.sleep()
+
+
+# フェーズ → 処理関数（イベントのあるフェーズはEventTimingをyieldするジェネレータ）
+PHASE_HANDLERS = {
+    GamePhase.BREAKFAST: _phase_breakfast,
+    GamePhase.GO_TO_WORK: _phase_go_to_work,
+    GamePhase.LUNCH: _phase_lunch,
+    GamePhase.LEAVE_WORK: _phase_leave_work,
+    GamePhase.SHOPPING: _phase_shopping,
+    GamePhase.HOLIDAY_SHOPPING_1: _phase_holiday_shopping,
+    GamePhase.HOLIDAY_LUNCH: _phase_holiday_lunch,
+    GamePhase.HOLIDAY_SHOPPING_2: _phase_holiday_shopping,
+    GamePhase.DINNER: _phase_dinner,
+    GamePhase.ONLINE_SHOPPING: _phase_online_shopping,
+    GamePhase.SLEEP: _phase_sleep,
+}
+
+
+def _start_phase(game: GameManager, policy: Policy, phase: GamePhase) -> Iterator[EventTiming] | None:
+    """フェーズ処理を開始し、イベント判定タイミングのイテレータを返す（イベントなしならNone）"""
+    handler = PHASE_HANDLERS.get(phase)
+    if handler is None:
+        return None
+    return handler(game, policy)
+
+
+def _finish_phase(game: GameManager, phase: GamePhase) -> bool:
+    """フェーズ処理後に次へ進める。ゲームが終了したらTrue"""
+    if phase == GamePhase.SLEEP:
+        game.start_new_day()
+        return game.is_game_complete() or game.is_game_over()
+
+    if game.is_game_over():
+        return True
+
+    game.advance_phase()
+    return False
+
+
+def play_phase(game: GameManager, policy: Policy) -> bool:
+    """現在のフェーズを1つ処理して次へ進める。ゲームが終了したらTrue"""
+    phase = game.get_current_phase()
+    steps = _start_phase(game, policy, phase)
+    if steps is not None:
+        for timing in steps:
+            _trigger_events(game, timing)
+    return _finish_phase(game, phase)
+
+
+def _finish_game(game: GameManager, seed: int | None, config_name: str) -> GameResult:
+    """終了したゲームの結果を作成"""
+    # クリア時はカード払い分を精算して最終所持金に反映
+    if game.is_game_complete():
+        game.player.settle_card()
+
+    return game.get_result(seed=seed, config_name=config_name)
+
+
+def play_game(game: GameManager, policy: Policy, seed: int | None = None,
+              config_name: str = "default") -> GameResult:
+    """作成済みのGameManagerでゲームを最後までプレイして結果を返す"""
+    while not play_phase(game, policy):
+        pass
+    return _finish_game(game, seed, config_name)
+
+
+def run_game(policy: Policy, character_id: str = 'regular', seed: int | None = None,
+             config_name: str = "default") -> GameResult:
+    """1ゲームをヘッドレスでプレイしてGameResultを返す
+
+    Args:
+        policy: 行動方針
+        character_id: キャラクターID
+        seed: 乱数シード（同じシード・方針なら同じ結果になる。方針の乱数もこのシードで初期化し直す）
+        config_name: 結果に記録する設定名
+    """
+    if seed is not None:
+        policy.reseed(seed)
+    game = create_game(character_id, seed=seed)
+    return play_game(game, policy, seed=seed, config_name=config_name)
+
+
+def run_games(policy: Policy, seeds: Iterable[int], character_id: str = 'regular',
+              config_name: str = "default") -> Iterator[GameResult]:
+    """複数シードでゲームを順番にプレイし、結果を1件ずつ返す"""
+    for seed in seeds:
+        yield run_game(policy, character_id=character_id, seed=seed, config_name=config_name)
+
+
+def run_games_lockstep(policy: Policy, seeds: Iterable[int], character_id: str = 'regular',
+                       config_name: str = "default", batch_seed: int | None = None) -> list[GameResult]:
+    """複数ゲームを足並みをそろえて進め、イベント判定をまとめて行う
+
+    同じEventTimingで止まっているゲームのイベント判定を
+    event_batch.trigger_events_batch で一括処理する。イベントの乱数は
+    batch_seedから作る共有の乱数で引くため、run_gameとは結果が一致しない。
+    policyは全ゲームで共有し、方針の乱数はbatch_seedで初期化し直す。
+
+    Returns:
+        seedsと同じ順序のGameResultリスト
+    """
+    seeds = list(seeds)
+    if batch_seed is not None:
+        policy.reseed(batch_seed)
+    games = [create_game(character_id, seed=seed) for seed in seeds]
+    rng = make_batch_rng(batch_seed)
+
+    active = list(range(len(games)))
+    while active:
+        phases = {i: games[i].get_current_phase() for i in active}
+
+        running = []
+        for i in active:
+            steps = _start_phase(games[i], policy, phases[i])
+            if steps is not None:
+                running.append((i, steps))
+
+        # 全ゲームのジェネレータを1歩ずつ進め、同じタイミングのものをまとめて判定
+        while running:
+            waiting: dict[EventTiming, list[tuple[int, Iterator[EventTiming]]]] = {}
+            for i, steps in running:
+                timing = next(steps, None)
+                if timing is not None:
+                    waiting.setdefault(timing, []).append((i, steps))
+
+            running = []
+            for timing, group in waiting.items():
+                trigger_events_batch(timing, [games[i] for i, _ in group], rng)
+                running.extend(group)
+
+        active = [i for i in active if not _finish_phase(games[i], phases[i])]
+
+    return [_finish_game(game, seed, config_name) for game, seed in zip(games, seeds)]
@@ -0,0 +1,392 @@
+"""GameManagerのスナップショット（バージョン付きのバイナリ形式）
+
+セッションの永続化・セーブ/ロード・シミュレーションのチェックポイントをプロセス間で
+受け渡すために、GameManagerの状態だけを小さなバイト列にする。
+イベント定義（関数を持つ）やレリック効果の集計など、マスターデータから作り直せるものは含めない。
+
+    data = snapshot(game)
+    game2 = restore(data)
+
+形式:
+    ヘッダ: MAGIC(4バイト) + FORMAT_VERSION(1バイト) + スキーマのダイジェスト(4バイト)
+            + 本体のcrc32(4バイト)
+    本体: 下のエンコーダで書いた1つの値（タプル。並びは _dump を参照）
+
+スキーマのダイジェストは、保存する各dataclassのフィールド名と、dataclassでない部分
+（本体のタプル・在庫のバッチ・レリック・食糧ストックなど）の並びを書いた _*_LAYOUT から作る。
+フィールドや並びが変わった後に古いスナップショットを読むと ValueError になる
+（_*_LAYOUT に表れない書き方の変更をしたら FORMAT_VERSION を上げる）。
+
+エンコーダはmsgpackと同じ考え方の小さなタグ付き形式（struct で詰める）:
+None/bool/int/float/str/bytes/list/dict を扱い、タプルはlistとして書く。
+乱数の状態（624語のMersenne Twister）は '<625I' で1つのbytesに詰める。
+"""
+import hashlib
+import random
+import struct
+import zlib
+from dataclasses import fields
+from enum import Enum
+
+from .day_cycle import DayState, GameManager, NutritionStreak, WeeklyStats
+from .event_data import EVENT_REGISTRY
+from .events import EventManager, Weather
+from .ingredients import Stock
+from .nutrition import Nutrition
+from .player import Player
+from .provisions import PendingDelivery, PreparedDish, ProvisionStock
+from .relic import RelicInventory
+from .result import GameStats
+from .temperament import BehaviorTracker
+from .weekly_boss import WEEKLY_BOSSES
+
+
+MAGIC = b'CKSS'
+FORMAT_VERSION = 3
+
+
+def _field_names(cls) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+# そのままの値（int/float/bool/dict）で保存するdataclassのフィールド順
+_PLAYER_FIELDS = _field_names(Player)
+_STATS_FIELDS = _field_names(GameStats)
+_STREAK_FIELDS = _field_names(NutritionStreak)
+_TRACKER_FIELDS = _field_names(BehaviorTracker)
+# Nutrition・Enumを含むdataclass（_record でNutritionは行、Enumは値にして書く）
+_DAY_STATE_FIELDS = _field_names(DayState)
+_WEEKLY_STATS_FIELDS = _field_names(WeeklyStats)
+_PREPARED_FIELDS = _field_names(PreparedDish)
+_PENDING_FIELDS = _field_names(PendingDelivery)
+_NUTRITION_FIELDS = _field_names(Nutrition)
+
+# dataclassでない部分の並び（_dump/_load の書き方を変えたらここも変える）
+_GAME_LAYOUT = GameManager._STATE_ATTRS          # 本体のタプル（GameManagerの属性名の順）
+_RNG_LAYOUT = ('version', 'mt_state', 'gauss_next')  # random.Random.getstate()
+_STOCK_LAYOUT = ('name', 'purchase_day', 'count')    # Stock.iter_batches() の順に平らに並べる
+_RELIC_LAYOUT = ('name', 'acquired_day')             # RelicInventory を取得順に平らに並べる
+_PROVISIONS_LAYOUT = ('items', 'prepared', 'pending')
+_EVENTS_LAYOUT = ('weather', 'triggered_today')
+
+SCHEMA_DIGEST = hashlib.blake2b(
+    repr((_PLAYER_FIELDS, _STATS_FIELDS, _STREAK_FIELDS, _TRACKER_FIELDS,
+          _DAY_STATE_FIELDS, _WEEKLY_STATS_FIELDS, _PREPARED_FIELDS, _PENDING_FIELDS,
+          _NUTRITION_FIELDS, _GAME_LAYOUT, _RNG_LAYOUT, _STOCK_LAYOUT, _RELIC_LAYOUT,
+          _PROVISIONS_LAYOUT, _EVENTS_LAYOUT)).encode(),
+    digest_size=4,
+).digest()
+
+_HEADER = MAGIC + bytes([FORMAT_VERSION]) + SCHEMA_DIGEST  # この後に本体のcrc32が続く
+_CHECKSUM = struct.Struct('<I')
+_BODY_START = len(_HEADER) + _CHECKSUM.size
+
+
+# === エンコーダ ===
+
+# タグ（0x00-0x7F は 0〜127 の整数そのもの）
+_NONE = 0xC0
+_FALSE = 0xC2
+_TRUE = 0xC3
+_BYTES = 0xC4
+_FLOAT = 0xCB
+_INT = 0xD3      # int64
+_BIGINT = 0xD4   # 符号付き・可変長（int64に収まらない整数）
+_STR = 0xD9
+_LIST = 0xDC
+_DICT = 0xDE
+
+_pack_int = struct.Struct('<q').pack
+_pack_float = struct.Struct('<d').pack
+_unpack_int = struct.Struct('<q').unpack_from
+_unpack_float = struct.Struct('<d').unpack_from
+_RNG_STATE = struct.Struct('<625I')
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _write_length(out: bytearray, n: int):
+    """長さを可変長（7ビットずつ）で書く"""
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _encode(value, out: bytearray):
+    # boolはintのサブクラスなので先に判定する
+    if value is None:
+        out.append(_NONE)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif type(value) is int:
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif _INT64_MIN <= value <= _INT64_MAX:
+            out.append(_INT)
+            out += _pack_int(value)
+        else:
+            data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+            out.append(_BIGINT)
+            _write_length(out, len(data))
+            out += data
+    elif type(value) is str:
+        data = value.encode()
+        out.append(_STR)
+        _write_length(out, len(data))
+        out += data
+    elif type(value) is float:
+        out.append(_FLOAT)
+        out += _pack_float(value)
+    elif type(value) is list or type(value) is tuple:
+        out.append(_LIST)
+        _write_length(out, len(value))
+        for item in value:
+            _encode(item, out)
+    elif type(value) is dict:
+        out.append(_DICT)
+        _write_length(out, len(value))
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    elif type(value) is bytes:
+        out.append(_BYTES)
+        _write_length(out, len(value))
+        out += value
+    else:
+        raise ValueError(f"スナップショットに書けない値です: {type(value).__name__}")
+
+
+def _read_length(data: bytes, pos: int) -> tuple[int, int]:
+    n = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _decode(data: bytes, pos: int):
+    """pos から1つ読み、(値, 次の位置) を返す（listはlistのまま返す）"""
+    tag = data[pos]
+    pos += 1
+    if tag < 0x80:
+        return tag, pos
+    if tag == _LIST:
+        n, pos = _read_length(data, pos)
+        items = []
+        for _ in range(n):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == _INT:
+        return _unpack_int(data, pos)[0], pos + 8
+    if tag == _STR:
+        n, pos = _read_length(data, pos)
+        return data[pos:pos + n].decode(), pos + n
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _FLOAT:
+        return _unpack_float(data, pos)[0], pos + 8
+    if tag == _DICT:
+        n, pos = _read_length(data, pos)
+        result = {}
+        for _ in range(n):
+            key, pos = _decode(data, pos)
+            result[key], pos = _decode(data, pos)
+        return result, pos
+    if tag == _BYTES:
+        n, pos = _read_length(data, pos)
+        return bytes(data[pos:pos + n]), pos + n
+    if tag == _BIGINT:
+        n, pos = _read_length(data, pos)
+        return int.from_bytes(data[pos:pos + n], 'little', signed=True), pos + n
+    raise ValueError(f"スナップショットのタグが不正です: 0x{tag:02X}")
+
+
+def encode_value(value) -> bytes:
+    """値を1つエンコードする（チェックポイントなどGameManager以外の受け渡し用）"""
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def decode_value(data: bytes):
+    """encode_valueで書いた値を読む（タプルはlistになる）"""
+    value, pos = _decode(data, 0)
+    if pos != len(data):
+        raise ValueError("スナップショットの末尾に余分なデータがあります")
+    return value
+
+
+# === GameManager ⇔ 値 ===
+
+def _record(obj, names: tuple[str, ...]) -> tuple:
+    """dataclassをフィールド順のタプルにする（Nutritionは行、Enumは値にする）"""
+    values = []
+    for name in names:
+        value = getattr(obj, name)
+        if isinstance(value, Nutrition):
+            value = value.to_row()
+        elif isinstance(value, Enum):
+            value = value.value
+        values.append(value)
+    return tuple(values)
+
+
+def _reader(field_type):
+    """_record で書いた値を読み戻す関数（変換しない型はNone）"""
+    if field_type is Nutrition:
+        return Nutrition.from_row
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        return field_type
+    return None
+
+
+# _record で書くdataclass → フィールド順の読み込み関数
+_READERS = {
+    cls: tuple(_reader(f.type) for f in fields(cls))
+    for cls in (DayState, WeeklyStats, PreparedDish, PendingDelivery)
+}
+
+
+def _from_record(cls, values: list):
+    """_record で書いたタプルからdataclassを作る"""
+    return cls(*[value if read is None else read(value)
+                 for read, value in zip(_READERS[cls], values)])
+
+
+def _dump(game: GameManager) -> tuple:
+    version, mt_state, gauss_next = game.rng.getstate()
+    provisions = game.provisions
+
+    stock = []
+    for name, day, count in game.stock.iter_batches():
+        stock += (name, day, count)
+    relics = []
+    for name in game.relics.get_all():  # 取得順
+        relics += (name, game.relics.get_acquired_day(name))
+
+    parts = {
+        'player': tuple(getattr(game.player, name) for name in _PLAYER_FIELDS),
+        'stock': stock,
+        'character_id': game.character_id,
+        'rng': (version, _RNG_STATE.pack(*mt_state), gauss_next),
+        'session_seed': game.session_seed,
+        'day_state': _record(game.day_state, _DAY_STATE_FIELDS),
+        'stats': tuple(getattr(game.stats, name) for name in _STATS_FIELDS),
+        'relics': relics,
+        'provisions': (
+            provisions.get_all(),
+            [_record(p, _PREPARED_FIELDS) for p in provisions._prepared],
+            [_record(p, _PENDING_FIELDS) for p in provisions.get_pending()],
+        ),
+        'events': (game.events.weather.value, sorted(game.events._triggered_today)),
+        'has_bonus': game.has_bonus,
+        'nutrition_streak': tuple(getattr(game.nutrition_streak, name) for name in _STREAK_FIELDS),
+        'behavior_tracker': tuple(getattr(game.behavior_tracker, name) for name in _TRACKER_FIELDS),
+        'weekly_stats': _record(game.weekly_stats, _WEEKLY_STATS_FIELDS),
+        '_daily_food_spending': game._daily_food_spending,
+        '_daily_cooked': game._daily_cooked,
+        'temperament_id': game.temperament_id,
+        'temperament_just_revealed': game.temperament_just_revealed,
+        'current_boss': game.current_boss.id if game.current_boss else None,
+        'boss_preview_shown': game.boss_preview_shown,
+        'boss_result': game.boss_result,
+        '_salary_amount': game._salary_amount,
+        '_bonus_amount': game._bonus_amount,
+        '_rent_amount': game._rent_amount,
+    }
+    return tuple(parts[name] for name in _GAME_LAYOUT)
+
+
+def _load(state: list) -> GameManager:
+    if len(state) != len(_GAME_LAYOUT):
+        raise ValueError("スナップショットの本体の長さがスキーマと合いません")
+    parts = dict(zip(_GAME_LAYOUT, state))
+
+    stock = Stock()
+    stock_flat = parts['stock']
+    for i in range(0, len(stock_flat), len(_STOCK_LAYOUT)):
+        stock.add(stock_flat[i], stock_flat[i + 2], stock_flat[i + 1])
+
+    relics = RelicInventory()
+    relics_flat = parts['relics']
+    for i in range(0, len(relics_flat), len(_RELIC_LAYOUT)):
+        relics.add(relics_flat[i], relics_flat[i + 1])
+
+    provisions = ProvisionStock()
+    items, prepared, pending = parts['provisions']
+    for name, quantity in items.items():
+        provisions.add(name, quantity)
+    provisions._prepared = [_from_record(PreparedDish, p) for p in prepared]
+    provisions._pending = [_from_record(PendingDelivery, p) for p in pending]
+
+    rng_version, mt_bytes, gauss_next = parts['rng']
+    rng = random.Random(0)  # すぐ setstate で上書きする（シード無指定だとos.urandomを読んで遅い）
+    rng.setstate((rng_version, _RNG_STATE.unpack(mt_bytes), gauss_next))
+    weather, triggered_today = parts['events']
+    events = EventManager(rng=rng, registry=EVENT_REGISTRY)
+    events.weather = Weather(weather)
+    events._triggered_today = set(triggered_today)
+
+    boss_id = parts['current_boss']
+    parts.update(
+        player=Player(*parts['player']),
+        stock=stock,
+        rng=rng,
+        day_state=_from_record(DayState, parts['day_state']),
+        stats=GameStats(*parts['stats']),
+        relics=relics,
+        provisions=provisions,
+        events=events,
+        nutrition_streak=NutritionStreak(*parts['nutrition_streak']),
+        behavior_tracker=BehaviorTracker(*parts['behavior_tracker']),
+        weekly_stats=_from_record(WeeklyStats, parts['weekly_stats']),
+        current_boss=WEEKLY_BOSSES[boss_id] if boss_id is not None else None,
+    )
+    return GameManager._from_state(**parts)
+
+
+def snapshot(game: GameManager) -> bytes:
+    """GameManagerの状態をスナップショットにする"""
+    body = bytearray()
+    _encode(_dump(game), body)
+    return _HEADER + _CHECKSUM.pack(zlib.crc32(body)) + bytes(body)
+
+
+def restore(data: bytes) -> GameManager:
+    """スナップショットからGameManagerを作り直す
+
+    Raises:
+        ValueError: 形式が違う・バージョンやスキーマが合わない・壊れている
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("スナップショットではありません")
+    if len(data) < _BODY_START:
+        raise ValueError("スナップショットが途中で切れています")
+    version = data[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"未対応のスナップショット形式です: v{version}（対応: v{FORMAT_VERSION}）")
+    if data[len(MAGIC) + 1:len(_HEADER)] != SCHEMA_DIGEST:
+        raise ValueError("スナップショットのスキーマが現在のゲームデータと合いません")
+    if _CHECKSUM.unpack_from(data, len(_HEADER))[0] != zlib.crc32(memoryview(data)[_BODY_START:]):
+        raise ValueError("スナップショットが壊れています: チェックサムが合いません")
+    try:
+        state, pos = _decode(data, _BODY_START)
+        if pos != len(data):
+            raise ValueError("スナップショットの末尾に余分なデータがあります")
+        return _load(state)
+    except (IndexError, KeyError, TypeError, AttributeError, OverflowError,
+            struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"スナップショットが壊れています: {e!r}") from e
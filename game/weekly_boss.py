@@ -272,12 +272,14 @@ def get_boss(boss_id: str) -> WeeklyBoss | None:
     return WEEKLY_BOSSES.get(boss_id)
 
 
-def select_weekly_boss(week_number: int, seed: int | None = None) -> WeeklyBoss | None:
+def select_weekly_boss(week_number: int, seed: int | None = None,
+                       rng: random.Random | None = None) -> WeeklyBoss | None:
     """週番号に基づいてボスを選択
 
     Args:
         week_number: 週番号（1週目, 2週目, ...）
         seed: ランダムシード（再現性のため）
+        rng: seedがない場合に使う乱数（省略時はグローバルなrandom）
 
     Returns:
         選択されたボス
@@ -287,16 +289,18 @@ def select_weekly_boss(week_number: int, seed: int | None = None) -> WeeklyBoss
 
     # シード設定
     if seed is not None:
-        random.seed(seed + week_number * 100)
+        rng = random.Random(seed + week_number * 100)
+    elif rng is None:
+        rng = random
 
     # 1週目はチュートリアルボスからランダム選択
     if week_number <= 1:
         tutorial_bosses = [WEEKLY_BOSSES[bid] for bid in tutorial_boss_ids]
-        return random.choice(tutorial_bosses)
+        return rng.choice(tutorial_bosses)
 
     # 2週目以降はチュートリアルボスを除外してランダム選択
     boss_list = [b for b in WEEKLY_BOSSES.values() if b.id not in tutorial_boss_ids]
-    return random.choice(boss_list)
+    return rng.choice(boss_list)
 
 
 def get_week_number(day: int) -> int:
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 from game.player import Player
 from game.nutrition import Nutrition
 from game.ingredients import Stock, get_ingredient, get_shop_items
-from game.cooking import Dish, get_recipe_suggestions, get_available_named_recipes, evaluate_cooking, CookingEvaluation
+from game.cooking import Dish, get_recipe_suggestions, get_named_recipes_for_mask, evaluate_cooking, CookingEvaluation
 from game.day_cycle import GameManager, GamePhase
 from game.constants import (
     MAX_ENERGY, MAX_STAMINA, MAX_FULLNESS, CAFETERIA_PRICE,
@@ -67,8 +67,7 @@ def show_stock(stock: Stock, current_day: int = 1, freshness_extend: int | Relic
 
 def show_recipe_suggestions(stock: Stock):
     """作れるネームド料理の候補を表示"""
-    available = stock.get_available_ingredients()
-    named_recipes = get_available_named_recipes(available)
+    named_recipes = get_named_recipes_for_mask(stock.get_mask())
 
     if named_recipes:
         print("【作れるネームド料理】")
@@ -778,8 +777,8 @@ def show_online_shop(game_manager, current_day: int = 1):
     all_provisions = get_all_provisions()
 
     # 食糧のセール品を決定（1つ20%オフ）
-    random.seed(current_day + 500)  # レリックと異なるシード
-    sale_provision_idx = random.randint(0, len(all_provisions) - 1)
+    rng = random.Random(current_day + 500)  # レリックと異なるシード
+    sale_provision_idx = rng.randint(0, len(all_provisions) - 1)
 
     while True:
         print("\n【オンラインショップ】 ※注文品は翌日届きます")